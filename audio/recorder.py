@@ -5,22 +5,27 @@ Modified to work with the new MS Word-like interface
 
 import threading
 import pyaudio
-import wave
-import tempfile
 import time
 import sounddevice as sd
 import numpy as np
 import keyboard
 from tkinter import messagebox
-import os
-from .transcription import TranscriptionService
+from .transcription import TranscriptionService, wav_buffer
+
+# Microphone chunks louder than this (int16 RMS) count as speech
+SPEECH_RMS_THRESHOLD = 500
+
+# Silence after speech that ends an utterance and sends it for transcription
+UTTERANCE_SILENCE_SECONDS = 0.8
 
 class AudioRecorder:
-    def __init__(self, settings_manager, status_callback=None, transcription_callback=None):
+    def __init__(self, settings_manager, status_callback=None, transcription_callback=None,
+                 state_change_callback=None, session=None):
         self.settings_manager = settings_manager
         self.status_callback = status_callback
         self.transcription_callback = transcription_callback
-        self.transcription_service = TranscriptionService(settings_manager)
+        self.state_change_callback = state_change_callback
+        self.transcription_service = TranscriptionService(settings_manager, session=session)
         
         # Initialize recording variables
         self.is_recording = False
@@ -39,6 +44,12 @@ class AudioRecorder:
         if self.status_callback:
             self.status_callback(message)
             
+    def set_recording(self, is_recording):
+        """Set the recording state and notify the state change callback."""
+        self.is_recording = is_recording
+        if self.state_change_callback:
+            self.state_change_callback(is_recording)
+            
     def start_microphone_transcription(self):
         """Start recording from the microphone for transcription."""
         api_key = self.settings_manager.get_api_key()
@@ -50,8 +61,7 @@ class AudioRecorder:
             return False
             
         self.update_status("Recording... (Hold the transcription key)")
-        self.is_recording = True
-        self.audio_frames = []
+        self.set_recording(True)
         
         # Start recording in a new thread
         self.recording_thread = threading.Thread(target=self.record_microphone)
@@ -60,7 +70,12 @@ class AudioRecorder:
         return True
         
     def record_microphone(self):
-        """Record audio from the microphone."""
+        """
+        Record audio from the microphone.
+        
+        The recording is split into utterances at pauses in speech, and each
+        utterance is sent for transcription while recording continues.
+        """
         stream = self.audio.open(
             format=self.audio_format,
             channels=self.channels,
@@ -69,40 +84,65 @@ class AudioRecorder:
             frames_per_buffer=self.chunk
         )
         
+        silence_chunks = int(UTTERANCE_SILENCE_SECONDS * self.rate / self.chunk)
+        utterance = []
+        heard_speech = False
+        quiet_count = 0
+        submitted = 0
+        
         # Record audio while key is held
         try:
             while keyboard.is_pressed(self.settings_manager.get_shortcuts()["transcribe"]):
                 data = stream.read(self.chunk)
-                self.audio_frames.append(data)
+                utterance.append(data)
+                
+                samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+                if np.sqrt(np.mean(np.square(samples))) >= SPEECH_RMS_THRESHOLD:
+                    heard_speech = True
+                    quiet_count = 0
+                elif heard_speech:
+                    quiet_count += 1
+                    if quiet_count >= silence_chunks:
+                        # End of an utterance: transcribe it while recording continues
+                        self.submit_utterance(utterance)
+                        submitted += 1
+                        utterance = []
+                        heard_speech = False
+                        quiet_count = 0
+                elif len(utterance) > silence_chunks:
+                    # Drop leading silence but keep a short lead-in
+                    del utterance[0]
+                    
                 time.sleep(0.01)  # Small delay to reduce CPU usage
         finally:
             stream.stop_stream()
             stream.close()
-            self.is_recording = False
+            self.set_recording(False)
             
-            if self.audio_frames:
-                self.update_status("Transcribing audio...")
-                self.transcribe_audio()
-            else:
+            # Send the last utterance; if nothing crossed the speech threshold,
+            # send the whole clip and let the API decide
+            if utterance and (heard_speech or not submitted):
+                self.submit_utterance(utterance)
+            elif not submitted:
                 self.update_status("Recording cancelled")
                 
-    def transcribe_audio(self):
-        """Transcribe recorded audio."""
-        try:
-            # Save the recorded audio to a temporary file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_wav:
-                temp_filename = temp_wav.name
+    def submit_utterance(self, frames):
+        """Send recorded frames for transcription without waiting for the result."""
+        self.update_status("Transcribing audio...")
+        
+        # Package the recorded audio as an in-memory WAV file
+        audio_file = wav_buffer(
+            b''.join(frames),
+            self.channels,
+            self.audio.get_sample_size(self.audio_format),
+            self.rate
+        )
+        self.transcription_service.transcribe_async(audio_file, self.on_transcription_done)
                 
-                wf = wave.open(temp_filename, 'wb')
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(self.audio.get_sample_size(self.audio_format))
-                wf.setframerate(self.rate)
-                wf.writeframes(b''.join(self.audio_frames))
-                wf.close()
-            
-            # Send to OpenAI for transcription
-            with open(temp_filename, "rb") as audio_file:
-                transcript = self.transcription_service.transcribe_with_openai(audio_file)
+    def on_transcription_done(self, future):
+        """Handle a finished microphone transcription."""
+        try:
+            transcript = future.result()
                 
             # Add the transcribed text via callback
             if transcript:
@@ -112,12 +152,6 @@ class AudioRecorder:
             else:
                 self.update_status("No speech detected")
                 
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_filename)
-            except:
-                pass
-                
         except Exception as e:
             self.update_status(f"Transcription error: {str(e)}")
             messagebox.showerror("Transcription Error", str(e))
@@ -133,7 +167,7 @@ class AudioRecorder:
             return False
             
         self.update_status("Recording system audio... (Release the key to stop)")
-        self.is_recording = True
+        self.set_recording(True)
         self.audio_frames = []
         
         # Start recording in a new thread
@@ -178,7 +212,7 @@ class AudioRecorder:
                     time.sleep(0.01)  # Small delay to reduce CPU usage
                     
             # Key was released, stop recording
-            self.is_recording = False
+            self.set_recording(False)
             
             if self.audio_frames:
                 self.update_status("Transcribing system audio...")
@@ -192,7 +226,7 @@ class AudioRecorder:
                 self.update_status("System audio recording cancelled")
                 
         except Exception as e:
-            self.is_recording = False
+            self.set_recording(False)
             self.update_status(f"System audio recording error: {str(e)}")
             
     def audio_callback(self, indata, frames, time, status):
@@ -211,19 +245,16 @@ class AudioRecorder:
             # Convert to a single numpy array
             audio_data = np.concatenate(self.audio_frames)
             
-            # Save to temporary WAV file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-                temp_filename = temp_wav.name
-                
-                with wave.open(temp_filename, 'wb') as wf:
-                    wf.setnchannels(channels)
-                    wf.setsampwidth(2)  # 16-bit
-                    wf.setframerate(sample_rate)
-                    wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
+            # Package as an in-memory 16-bit WAV file
+            audio_file = wav_buffer(
+                (audio_data * 32767).astype(np.int16).tobytes(),
+                channels,
+                2,  # 16-bit
+                sample_rate
+            )
                     
             # Send to OpenAI for transcription
-            with open(temp_filename, "rb") as audio_file:
-                transcript = self.transcription_service.transcribe_with_openai(audio_file)
+            transcript = self.transcription_service.transcribe_with_openai(audio_file)
                 
             # Add the transcribed text
             if transcript:
@@ -233,12 +264,6 @@ class AudioRecorder:
             else:
                 self.update_status("No speech detected in system audio")
                 
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_filename)
-            except:
-                pass
-                
         except Exception as e:
             self.update_status(f"System audio processing error: {str(e)}")
             messagebox.showerror("Transcription Error", str(e))
\ No newline at end of file
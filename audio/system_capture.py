@@ -6,14 +6,12 @@ Zoom conferences, and other media for transcription.
 
 import threading
 import time
-import tempfile
-import os
-import wave
 import numpy as np
 import sounddevice as sd
 from tkinter import messagebox
 import keyboard
 import queue
+from .transcription import wav_buffer
 
 class SystemAudioCapture:
     def __init__(self, settings_manager, transcription_service, status_callback=None, 
@@ -256,20 +254,17 @@ class SystemAudioCapture:
                 self.update_status("Audio appears to be silent, skipping transcription")
                 return
                 
-            # Save to temporary WAV file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-                temp_filename = temp_wav.name
-                
-                with wave.open(temp_filename, 'wb') as wf:
-                    wf.setnchannels(self.channels)
-                    wf.setsampwidth(2)  # 16-bit
-                    wf.setframerate(self.sample_rate)
-                    wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
+            # Package as an in-memory 16-bit WAV file
+            audio_file = wav_buffer(
+                (audio_data * 32767).astype(np.int16).tobytes(),
+                self.channels,
+                2,  # 16-bit
+                self.sample_rate
+            )
                     
             # Send to transcription service
-            with open(temp_filename, "rb") as audio_file:
-                self.update_status("Transcribing audio...")
-                transcript = self.transcription_service.transcribe_with_openai(audio_file)
+            self.update_status("Transcribing audio...")
+            transcript = self.transcription_service.transcribe_with_openai(audio_file)
                 
             # Add the transcribed text to the editor
             if transcript:
@@ -279,12 +274,6 @@ class SystemAudioCapture:
             else:
                 self.update_status("No speech detected in system audio")
                 
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_filename)
-            except:
-                pass
-                
         except Exception as e:
             error_msg = str(e)
             self.update_status(f"System audio processing error: {error_msg}")
@@ -310,7 +299,7 @@ class SystemAudioCapture:
                 # Process if we have enough data or enough time has passed
                 if chunk_duration >= self.chunk_duration or time_since_last >= 30:
                     if chunk_frames:
-                        # Process this chunk
+                        # Process this chunk (transcribed without blocking the capture loop)
                         self._process_chunk(chunk_frames)
                         chunk_frames = []  # Reset for next chunk
                         last_process_time = current_time
@@ -334,30 +323,29 @@ class SystemAudioCapture:
             if rms < 0.001:  # Very low amplitude threshold
                 return  # Skip silent audio
                 
-            # Save to temporary WAV file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-                temp_filename = temp_wav.name
-                
-                with wave.open(temp_filename, 'wb') as wf:
-                    wf.setnchannels(self.channels)
-                    wf.setsampwidth(2)  # 16-bit
-                    wf.setframerate(self.sample_rate)
-                    wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
+            # Package as an in-memory 16-bit WAV file
+            audio_file = wav_buffer(
+                (audio_data * 32767).astype(np.int16).tobytes(),
+                self.channels,
+                2,  # 16-bit
+                self.sample_rate
+            )
                     
-            # Send to transcription service
-            with open(temp_filename, "rb") as audio_file:
-                transcript = self.transcription_service.transcribe_with_openai(audio_file)
+            # Send to transcription service; results come back in chunk order
+            self.transcription_service.transcribe_async(audio_file, self._on_chunk_transcribed)
                 
+        except Exception as e:
+            self.update_status(f"Error processing audio chunk: {str(e)}")
+            
+    def _on_chunk_transcribed(self, future):
+        """Handle a finished chunk transcription."""
+        try:
+            transcript = future.result()
+            
             # Add the transcribed text if any
             if transcript and self.text_callback:
                 self.text_callback(transcript + " ")
                 
-            # Clean up temp file
-            try:
-                os.unlink(temp_filename)
-            except:
-                pass
-                
         except Exception as e:
             self.update_status(f"Error processing audio chunk: {str(e)}")
             
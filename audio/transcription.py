@@ -3,18 +3,101 @@ Audio transcription services for the TextEditor.
 """
 
 import requests
-import tempfile
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import io
 import os
 import wave
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox
 import numpy as np
 
+# Shared by microphone and system audio so their requests run concurrently
+TRANSCRIBE_POOL = ThreadPoolExecutor(max_workers=4)
+
+def create_session():
+    """
+    Create an HTTP session for the transcription API.
+    
+    The session keeps connections alive between requests, so only the first
+    transcription pays for the TCP and TLS handshake.
+    
+    Returns:
+        requests.Session: Session with a pooled, retrying HTTPS adapter
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.3)
+    )
+    session.mount("https://", adapter)
+    return session
+
+def wav_buffer(pcm_data, channels, sample_width, rate):
+    """
+    Package raw PCM data as an in-memory WAV file.
+    
+    Args:
+        pcm_data: Interleaved PCM sample bytes
+        channels: Number of audio channels
+        sample_width: Bytes per sample
+        rate: Sample rate of the audio
+        
+    Returns:
+        io.BytesIO: WAV file positioned at the start
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sample_width)
+        wf.setframerate(rate)
+        wf.writeframes(pcm_data)
+    buffer.seek(0)
+    return buffer
+
 class TranscriptionService:
-    def __init__(self, settings_manager):
+    def __init__(self, settings_manager, session=None):
         self.settings_manager = settings_manager
+        self.session = session or create_session()
         self.last_error = None
         
+        # Results of concurrent requests are handed back in submission order
+        self._order_lock = threading.RLock()
+        self._next_submit = 0
+        self._next_deliver = 0
+        self._finished = {}
+        
+    def transcribe_async(self, audio_file, done_callback):
+        """
+        Transcribe an audio file on the shared transcription pool.
+        
+        Up to four requests run at once, but done_callback receives the
+        futures in the order the files were submitted, so transcripts are
+        never inserted out of order.
+        
+        Args:
+            audio_file: An open file object containing audio data.
+            done_callback: Called with the finished Future (on a worker thread).
+        """
+        with self._order_lock:
+            seq = self._next_submit
+            self._next_submit += 1
+            
+        future = TRANSCRIBE_POOL.submit(self.transcribe_with_openai, audio_file)
+        future.add_done_callback(lambda f: self._deliver_in_order(seq, f, done_callback))
+        
+    def _deliver_in_order(self, seq, future, done_callback):
+        """Hold finished requests until every earlier request has been delivered."""
+        with self._order_lock:
+            self._finished[seq] = (future, done_callback)
+            while self._next_deliver in self._finished:
+                ready, callback = self._finished.pop(self._next_deliver)
+                self._next_deliver += 1
+                callback(ready)
+        
     def transcribe_with_openai(self, audio_file):
         """
         Transcribe audio file using OpenAI's API.
@@ -29,9 +112,10 @@ class TranscriptionService:
         if not api_key:
             raise ValueError("API key not configured")
             
-        headers = {
-            "Authorization": f"Bearer {api_key}"
-        }
+        # Only touch the session headers when the API key changes
+        authorization = f"Bearer {api_key}"
+        if self.session.headers.get("Authorization") != authorization:
+            self.session.headers["Authorization"] = authorization
         
         try:
             # Reset file pointer to the beginning
@@ -60,9 +144,8 @@ class TranscriptionService:
             }
             
             # Send request to OpenAI API
-            response = requests.post(
+            response = self.session.post(
                 "https://api.openai.com/v1/audio/transcriptions",
-                headers=headers,
                 files=files,
                 timeout=30  # Add timeout to prevent hanging
             )
@@ -118,44 +201,25 @@ class TranscriptionService:
                 if rms < 0.001:  # Very low sound threshold
                     return ""
                     
-            # Save to temporary WAV file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-                temp_filename = temp_wav.name
+            if audio_device and audio_format:
+                sample_width = audio_device.get_sample_size(audio_format)
+            else:
+                sample_width = 2  # Default to 16-bit if no format specified
                 
-                with wave.open(temp_filename, 'wb') as wf:
-                    wf.setnchannels(channels)
-                    if audio_device and audio_format:
-                        wf.setsampwidth(audio_device.get_sample_size(audio_format))
-                    else:
-                        wf.setsampwidth(2)  # Default to 16-bit if no format specified
-                    wf.setframerate(rate)
-                    
-                    # Handle different types of audio data
-                    if isinstance(audio_frames[0], bytes):
-                        # PyAudio byte format
-                        wf.writeframes(b''.join(audio_frames))
-                    elif isinstance(audio_frames[0], np.ndarray):
-                        # Sounddevice float32 format - convert to int16
-                        audio_data = np.concatenate(audio_frames)
-                        wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
-                    else:
-                        raise ValueError(f"Unsupported audio data format: {type(audio_frames[0])}")
-                
-            # Verify the file was created properly
-            if not os.path.exists(temp_filename) or os.path.getsize(temp_filename) < 44:
-                raise ValueError("Failed to create valid WAV file")
-                
-            # Send to OpenAI for transcription
-            with open(temp_filename, "rb") as audio_file:
-                transcript = self.transcribe_with_openai(audio_file)
-                
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_filename)
-            except:
-                pass
+            # Handle different types of audio data
+            if isinstance(audio_frames[0], bytes):
+                # PyAudio byte format
+                pcm_data = b''.join(audio_frames)
+            elif isinstance(audio_frames[0], np.ndarray):
+                # Sounddevice float32 format - convert to int16
+                audio_data = np.concatenate(audio_frames)
+                pcm_data = (audio_data * 32767).astype(np.int16).tobytes()
+            else:
+                raise ValueError(f"Unsupported audio data format: {type(audio_frames[0])}")
                 
-            return transcript
+            # Build the WAV in memory and send it to OpenAI for transcription
+            audio_file = wav_buffer(pcm_data, channels, sample_width, rate)
+            return self.transcribe_with_openai(audio_file)
                 
         except Exception as e:
             self.last_error = str(e)
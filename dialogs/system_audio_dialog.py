@@ -6,6 +6,11 @@ Allows users to configure system audio capture settings.
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+SYSTEM_AUDIO_DESCRIPTION = (
+    "Capture system audio from sources like YouTube videos, Zoom meetings, "
+    "and other media for transcription. This requires a system audio loopback device."
+)
+
 class SystemAudioDialog(tk.Toplevel):
     def __init__(self, parent, system_audio_capture, settings_manager, save_callback=None):
         super().__init__(parent)
@@ -36,15 +41,15 @@ class SystemAudioDialog(tk.Toplevel):
         self.save_callback = save_callback
         
         # Get current settings
-        self.system_audio_enabled = self.settings_manager.get_setting("system_audio", False)
-        self.continuous_mode = self.settings_manager.get_setting("continuous_transcription", False)
-        self.chunk_duration = self.settings_manager.get_setting("chunk_duration", 10)
-        self.selected_device_id = self.settings_manager.get_setting("audio_device_id", None)
+        self.load_settings()
         
         # Make dialog modal
         self.transient(parent)
         self.grab_set()
         
+        # Closing the window only hides it so the widget tree can be reused
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        
         # Configure the window
         self.configure(bg=self.bg_color)
         
@@ -62,6 +67,35 @@ class SystemAudioDialog(tk.Toplevel):
         # Scan for audio devices
         self.scan_devices()
         
+    def load_settings(self):
+        """Read the current system audio settings."""
+        self.system_audio_enabled = self.settings_manager.get_setting("system_audio", False)
+        self.continuous_mode = self.settings_manager.get_setting("continuous_transcription", False)
+        self.chunk_duration = self.settings_manager.get_setting("chunk_duration", 10)
+        self.selected_device_id = self.settings_manager.get_setting("audio_device_id", None)
+        
+    def show(self):
+        """Show the hidden dialog again with the current settings."""
+        self.load_settings()
+        self.system_audio_var.set(self.system_audio_enabled)
+        self.continuous_var.set(self.continuous_mode)
+        self.chunk_var.set(self.chunk_duration)
+        self.toggle_continuous_options()
+        
+        current_shortcut = self.settings_manager.get_shortcuts().get("system_audio", "F10")
+        self.shortcut_label.configure(text=f"Current shortcut: {current_shortcut.upper()}")
+        
+        self.select_configured_device()
+        
+        self.deiconify()
+        self.lift()
+        self.grab_set()
+        
+    def close(self):
+        """Hide the dialog instead of destroying it."""
+        self.grab_release()
+        self.withdraw()
+        
     def create_widgets(self):
         """Create the dialog widgets."""
         # Main frame with padding
@@ -81,10 +115,7 @@ class SystemAudioDialog(tk.Toplevel):
         # Description
         description = tk.Label(
             main_frame,
-            text=(
-                "Capture system audio from sources like YouTube videos, Zoom meetings, "
-                "and other media for transcription. This requires a system audio loopback device."
-            ),
+            text=SYSTEM_AUDIO_DESCRIPTION,
             wraplength=510,
             justify=tk.LEFT,
             bg=self.bg_color,
@@ -223,12 +254,13 @@ class SystemAudioDialog(tk.Toplevel):
         
         # Current shortcut display
         current_shortcut = self.settings_manager.get_shortcuts().get("system_audio", "F10")
-        tk.Label(
+        self.shortcut_label = tk.Label(
             shortcut_frame,
             text=f"Current shortcut: {current_shortcut.upper()}",
             bg=self.bg_color,
             fg=self.text_color
-        ).pack(anchor=tk.W)
+        )
+        self.shortcut_label.pack(anchor=tk.W)
         
         # Info about changing shortcuts
         tk.Label(
@@ -258,7 +290,7 @@ class SystemAudioDialog(tk.Toplevel):
         cancel_button = tk.Button(
             button_frame,
             text="Cancel",
-            command=self.destroy,
+            command=self.close,
             bg=self.button_bg,
             fg=self.button_fg,
             padx=15,
@@ -315,19 +347,24 @@ class SystemAudioDialog(tk.Toplevel):
             self.device_ids.extend(input_ids)
             
             # Select the currently configured device if available
-            if self.selected_device_id is not None:
-                try:
-                    index = self.device_ids.index(self.selected_device_id)
-                    self.device_listbox.selection_set(index)
-                    self.device_listbox.see(index)
-                except ValueError:
-                    # Device not found in list
-                    pass
+            self.select_configured_device()
                     
         except Exception as e:
             self.device_listbox.insert(tk.END, f"Error scanning devices: {str(e)}")
             messagebox.showerror("Device Scan Error", f"Could not scan audio devices: {str(e)}")
             
+    def select_configured_device(self):
+        """Select the configured device in the device list."""
+        self.device_listbox.selection_clear(0, tk.END)
+        if self.selected_device_id is not None:
+            try:
+                index = self.device_ids.index(self.selected_device_id)
+                self.device_listbox.selection_set(index)
+                self.device_listbox.see(index)
+            except (AttributeError, ValueError):
+                # Device list not scanned yet or device not found in list
+                pass
+            
     def test_audio_capture(self):
         """Test the selected audio device with a short capture."""
         # Get the selected device
@@ -452,4 +489,4 @@ class SystemAudioDialog(tk.Toplevel):
             })
             
         # Close the dialog
-        self.destroy()
\ No newline at end of file
+        self.close()
\ No newline at end of file
@@ -4,23 +4,71 @@ Handles file save, open, and new document operations.
 """
 
 import os
+import io
 import json
-from tkinter import filedialog, messagebox
+import html
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+from text.editor import insert_chunked
+
+# Documents larger than this are copied to disk in chunks of this size
+WRITE_CHUNK_SIZE = 1 << 20
 
 class FileOperations:
-    def __init__(self, text_widget, update_title_callback=None, update_status_callback=None):
+    def __init__(self, text_widget, update_title_callback=None, update_status_callback=None,
+                 modified_callback=None):
         self.text_widget = text_widget
         self.current_file = None
+        self.current_basename = None
         self.update_title = update_title_callback
         self.update_status = update_status_callback
+        self.modified_callback = modified_callback
+        
+        # Track unsaved changes via Tk's modified flag instead of reading the document;
+        # the hash of the last saved text catches edits that were undone again
+        self._dirty = False
+        self._clean_hash = hash("")
+        
+        # Bumped whenever the document is marked clean (saved, opened or
+        # new), so a failed save only marks it dirty again if nothing
+        # happened since
+        self._save_generation = 0
+        self.text_widget.bind("<<Modified>>", self._on_modified, add="+")
+        
+        # Single worker so saves reach the disk in the order they were requested
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
         
+    def _on_modified(self, event=None):
+        """Record that the document changed since the last save."""
+        # Resetting the flag fires <<Modified>> again, so ignore the False edge
+        if self.text_widget.edit_modified():
+            self._dirty = True
+            self.text_widget.edit_modified(False)
+            if self.modified_callback:
+                self.modified_callback()
+            
+    def _set_current_file(self, file_path):
+        """Set the current file and cache its display name."""
+        self.current_file = file_path
+        self.current_basename = os.path.basename(file_path) if file_path else None
+            
+    def _mark_clean(self, content=""):
+        """Mark the document as saved with the given content."""
+        self._dirty = False
+        self._clean_hash = hash(content)
+        self._save_generation += 1
+        self.text_widget.edit_modified(False)
+
     def new_file(self, confirm_save=True):
         """Create a new empty file."""
-        if confirm_save and self.has_content() and messagebox.askyesno("Save?", "Do you want to save your current work?"):
+        if confirm_save and self.is_dirty() and messagebox.askyesno("Save?", "Do you want to save your current work?"):
             self.save_file()
             
         self.text_widget.delete("1.0", "end")
-        self.current_file = None
+        self._set_current_file(None)
+        self._mark_clean()
         
         if self.update_title:
             self.update_title("Modern Text Editor - Word Style")
@@ -32,9 +80,10 @@ class FileOperations:
     
     def open_file(self):
         """Open a file."""
-        if self.has_content() and messagebox.askyesno("Save?", "Do you want to save your current work?"):
+        if self.is_dirty() and messagebox.askyesno("Save?", "Do you want to save your current work?"):
             self.save_file()
         
+        from tkinter import filedialog
         file_path = filedialog.askopenfilename(
             defaultextension=".txt", 
             filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
@@ -49,14 +98,15 @@ class FileOperations:
                 
             # Clear current content and insert new content
             self.text_widget.delete("1.0", "end")
-            self.text_widget.insert("1.0", content)
+            insert_chunked(self.text_widget, content)
             
             # Update current file
-            self.current_file = file_path
+            self._set_current_file(file_path)
+            self._mark_clean(content)
             
             # Update UI
             if self.update_title:
-                self.update_title(f"Modern Text Editor - {os.path.basename(file_path)}")
+                self.update_title(f"Modern Text Editor - {self.current_basename}")
                 
             if self.update_status:
                 self.update_status(f"Opened: {file_path}")
@@ -67,26 +117,86 @@ class FileOperations:
             messagebox.showerror("Error", f"Could not open file: {e}")
             return False
     
-    def save_file(self):
-        """Save the current file."""
+    def save_file(self, wait=False):
+        """
+        Save the current file.
+        
+        The document is written on a background thread; the status bar is
+        updated once the write has finished.
+        
+        Args:
+            wait (bool): Block until the write has finished (e.g. before exiting)
+            
+        Returns:
+            bool: True if the save was started (or completed when waiting)
+        """
         if not self.current_file:
-            return self.save_file_as()
+            return self.save_file_as(wait=wait)
             
+        # Snapshot the document on the UI thread, then hand it to the worker
+        path = self.current_file
+        content = self.text_widget.get("1.0", "end-1c")
+        self._mark_clean(content)
+        generation = self._save_generation
+        
+        future = self._io_pool.submit(self._write_atomic, path, content)
+        if wait:
+            # Future.exception() blocks until the write has finished
+            return self._on_save_done(path, generation, future)
+            
+        future.add_done_callback(
+            lambda f: self.text_widget.after(0, self._on_save_done, path, generation, f)
+        )
+        return True
+    
+    def _write_atomic(self, path, content):
+        """Write content to a temporary file and move it over the target."""
+        # Replace the file a symlink points to, not the link itself
+        path = os.path.realpath(path)
+        temp_path = path + ".tmp"
         try:
-            content = self.text_widget.get("1.0", "end-1c")
-            with open(self.current_file, 'w', encoding='utf-8') as file:
-                file.write(content)
-                
-            if self.update_status:
-                self.update_status(f"Saved: {self.current_file}")
+            with open(temp_path, 'w', encoding='utf-8', buffering=WRITE_CHUNK_SIZE) as file:
+                if len(content) <= WRITE_CHUNK_SIZE:
+                    file.write(content)
+                else:
+                    # Encode in bounded chunks instead of one buffer the size of the document
+                    shutil.copyfileobj(io.StringIO(content), file, length=WRITE_CHUNK_SIZE)
+                    
+            # Keep the permission bits of the file being replaced
+            try:
+                shutil.copymode(path, temp_path)
+            except FileNotFoundError:
+                pass  # New file
                 
-            return True
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not save file: {e}")
+            os.replace(temp_path, path)
+        except Exception:
+            # Don't leave a partial temporary file behind
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _on_save_done(self, path, generation, future):
+        """Report the result of a background save on the UI thread."""
+        error = future.exception()
+        if error:
+            # Nothing on disk matches the document any more, unless a newer
+            # save, or another document, has replaced it since
+            if generation == self._save_generation:
+                self._dirty = True
+                self._clean_hash = None
+            messagebox.showerror("Error", f"Could not save file: {error}")
             return False
+            
+        if self.update_status:
+            self.update_status(f"Saved: {path}")
+            
+        return True
     
-    def save_file_as(self):
+    def save_file_as(self, wait=False):
         """Save the current file with a new name."""
+        from tkinter import filedialog
         file_path = filedialog.asksaveasfilename(
             defaultextension=".txt", 
             filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
@@ -95,23 +205,34 @@ class FileOperations:
         if not file_path:
             return False
             
-        self.current_file = file_path
+        self._set_current_file(file_path)
         
         if self.update_title:
-            self.update_title(f"Modern Text Editor - {os.path.basename(file_path)}")
+            self.update_title(f"Modern Text Editor - {self.current_basename}")
             
-        return self.save_file()
+        return self.save_file(wait=wait)
     
     def has_content(self):
         """Check if the document has any content."""
         return len(self.text_widget.get("1.0", "end-1c").strip()) > 0
     
+    def is_dirty(self):
+        """Check if the document has unsaved changes."""
+        if not self._dirty:
+            return False
+            
+        # Only read the document when the modified flag says something changed
+        if hash(self.text_widget.get("1.0", "end-1c")) == self._clean_hash:
+            self._dirty = False
+        return self._dirty
+    
     def get_current_file(self):
         """Get the current file path."""
         return self.current_file
         
     def export_as_html(self):
         """Export the document as HTML."""
+        from tkinter import filedialog
         file_path = filedialog.asksaveasfilename(
             defaultextension=".html", 
             filetypes=[("HTML Files", "*.html"), ("All Files", "*.*")]
@@ -124,12 +245,13 @@ class FileOperations:
             # Get text content
             content = self.text_widget.get("1.0", "end-1c")
             
-            # Apply simple HTML conversion
-            html_content = f"""<!DOCTYPE html>
+            # Write the document line by line, escaping HTML special characters
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write(f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
-    <title>{os.path.basename(file_path)}</title>
+    <title>{html.escape(os.path.basename(file_path))}</title>
     <style>
         body {{
             font-family: Calibri, Arial, sans-serif;
@@ -140,12 +262,21 @@ class FileOperations:
     </style>
 </head>
 <body>
-    {content.replace('\n', '<br>\n')}
+    """)
+                # Escape and write one line at a time, with a <br> at each
+                # "\n" only (found in place, without a list of all lines)
+                start = 0
+                while True:
+                    end = content.find('\n', start)
+                    if end == -1:
+                        file.write(html.escape(content[start:]))
+                        break
+                    file.write(html.escape(content[start:end]))
+                    file.write('<br>\n')
+                    start = end + 1
+                file.write("""
 </body>
-</html>"""
-            
-            with open(file_path, 'w', encoding='utf-8') as file:
-                file.write(html_content)
+</html>""")
                 
             if self.update_status:
                 self.update_status(f"Exported as HTML: {file_path}")
@@ -2,11 +2,8 @@
 import os
 import sys
 
-# Get the absolute path of the script's directory
-current_dir = os.path.dirname(os.path.abspath(__file__))
-
-# Add the current directory to Python path
-sys.path.insert(0, current_dir)
+# Add the script's directory to Python path
+sys.path.insert(0, os.path.dirname(__file__) or '.')
 
 # Import and run the main function
 if __name__ == "__main__":
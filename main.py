@@ -5,39 +5,140 @@ Main entry point for the application
 """
 
 import tkinter as tk
-import sys
-
-# Check for required packages
-try:
-    import requests
-    import keyboard
-    import sounddevice
-    import pyaudio
-    import numpy as np
-    import pydub
-except ImportError:
-    print("Please install the required packages with:")
-    print("pip install requests keyboard pyaudio pydub sounddevice numpy")
-    sys.exit(1)
+import queue
+import threading
+import importlib
 
 # Import modular components
 from config import SettingsManager
 from ui.theme import ThemeManager
 from ui.document import DocumentManager
 from ui.toolbar import ToolbarManager
-from ui.statusbar import StatusBarManager
+from ui.statusbar import StatusBarManager, count_words, recount_words
 from text.formatter import TextFormatter
 from text.search import TextSearcher
 from text.statistics import DocumentStatistics
 from file.operations import FileOperations
 from dialogs import APIKeyDialog, ShortcutEditor
-from audio.recorder import AudioRecorder
 from dialogs.system_audio_dialog import SystemAudioDialog
-from audio.system_capture import SystemAudioCapture
+
+ABOUT_TEXT = (
+    "Modern Text Editor\n\n"
+    "Version 1.0.0\n\n"
+    "A Microsoft Word-like text editor with A4 paper format.\n"
+    "Includes speech-to-text capabilities and basic text formatting."
+)
+
+PRINT_PLACEHOLDER_TEXT = "Print feature is not implemented in this version"
+SPELL_CHECK_PLACEHOLDER_TEXT = "Spell check feature is not implemented in this version."
+
+# Dialogs imported on first use: name -> (module, class, display name)
+LAZY_DIALOGS = {
+    "find": ("dialogs.find_dialog", "FindDialog", "Find"),
+    "replace": ("dialogs.replace_dialog", "ReplaceDialog", "Replace"),
+    "font": ("dialogs.font_dialog", "FontDialog", "Font")
+}
+
+# keyboard module key names that differ from Tk keysyms
+TK_KEY_NAMES = {
+    "enter": "Return",
+    "esc": "Escape",
+    "escape": "Escape",
+    "space": "space",
+    "tab": "Tab",
+    "backspace": "BackSpace",
+    "delete": "Delete",
+    "insert": "Insert",
+    "home": "Home",
+    "end": "End",
+    "page up": "Prior",
+    "page down": "Next",
+    "up": "Up",
+    "down": "Down",
+    "left": "Left",
+    "right": "Right"
+}
+
+TK_MODIFIERS = {
+    "ctrl": "Control",
+    "control": "Control",
+    "alt": "Alt",
+    "shift": "Shift"
+}
+
+def hotkey_to_sequence(hotkey):
+    """
+    Convert a keyboard module hotkey (e.g. "ctrl+shift+s") to a Tk event sequence.
+    
+    Args:
+        hotkey: Hotkey string as stored in the shortcut settings
+        
+    Returns:
+        str: Tk event sequence such as "<Control-Shift-S>"
+        
+    Raises:
+        ValueError: If the hotkey has no key or a modifier Tk doesn't know
+    """
+    parts = [part.strip().lower() for part in hotkey.split("+")]
+    key = parts[-1]
+    if not key:
+        raise ValueError(f"no key in hotkey {hotkey!r}")
+    unknown = [part for part in parts[:-1] if part not in TK_MODIFIERS]
+    if unknown:
+        raise ValueError(f"unsupported modifier {unknown[0]!r} in hotkey {hotkey!r}")
+    modifiers = [TK_MODIFIERS[part] for part in parts[:-1]]
+    
+    if key.isdigit():
+        # A bare digit would be read as a mouse button number
+        key = "Key-" + key
+    elif len(key) == 1:
+        # Tk reports shifted letters with the upper-case keysym
+        key = key.upper() if "Shift" in modifiers else key
+    elif key[0] == "f" and key[1:].isdigit():
+        key = key.upper()
+    else:
+        key = TK_KEY_NAMES.get(key, key)
+        
+    return "<" + "-".join(modifiers + [key]) + ">"
+
+def unbind_callback(widget, sequence, funcid):
+    """
+    Remove one callback bound to a sequence, keeping the widget's other bindings.
+    
+    (Misc.unbind with a funcid clears the whole sequence before Python 3.13.)
+    """
+    script = widget.bind(sequence)
+    kept = "\n".join(line for line in script.split("\n") if funcid not in line)
+    widget.tk.call("bind", widget._w, sequence, kept)
+    widget.deletecommand(funcid)
 
 class TextEditorApp:
     """Modern text editor application with A4 paper formatting."""
     
+    # Shortcuts: (action, default hotkey, method name, global, extra add_hotkey options)
+    # Only push-to-talk needs a system-wide hook; the rest are Tk bindings that
+    # fire while the editor has focus
+    SHORTCUT_SPECS = (
+        ("transcribe", "f9", "start_transcription", True, {"trigger_on_release": False}),
+        ("system_audio", "f10", "start_system_audio_capture", True, {"trigger_on_release": False}),
+        ("cut", "ctrl+x", "cut", False, {}),
+        ("copy", "ctrl+c", "copy", False, {}),
+        ("paste", "ctrl+v", "paste", False, {}),
+        ("save", "ctrl+s", "save_file", False, {}),
+        ("open", "ctrl+o", "open_file", False, {}),
+        ("new", "ctrl+n", "new_file", False, {})
+    )
+    
+    # Methods handed to the toolbar, keyed by the same name
+    FORMAT_CALLBACK_NAMES = (
+        'apply_font',
+        'toggle_bold',
+        'toggle_italic',
+        'toggle_underline',
+        'set_alignment',
+        'start_transcription'
+    )
+    
     def __init__(self, root):
         """Initialize the application.
         
@@ -57,39 +158,84 @@ class TextEditorApp:
         self.theme_manager.set_current_theme(theme_name)
         self.theme = self.theme_manager.get_theme()
         
-        # For easy access, set theme variables on the instance
-        for key, value in self.theme.items():
-            setattr(self, key, value)
-        
         # Configure root window
-        self.root.configure(bg=self.bg_color)
+        self.root.configure(bg=self.theme["bg_color"])
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
         
-        # Main frame
-        self.main_frame = tk.Frame(root, bg=self.bg_color)
-        self.main_frame.pack(fill=tk.BOTH, expand=True)
+        # Main frame, created by new_main_frame for each screen
+        self.main_frame = None
+        
+        # File operations, created with the main interface (the window can be
+        # closed from the API key screen before it exists)
+        self.file_operations = None
         
-        # Initialize text queue for transcribed text
-        self.text_queue = tk.StringVar()
+        # Initialize text queue for transcribed text (filled from worker threads,
+        # drained on the Tk thread by a polling loop)
+        self.text_queue = queue.SimpleQueue()
         
         # Initialize current file path
         self.current_file = None
         
+        # Callback that resets the toolbar microphone button when recording stops
+        self.mic_reset_callback = None
+        
+        # Hotkeys currently registered with the keyboard module
+        # (action -> (hotkey, handle returned by keyboard.add_hotkey))
+        self.installed_shortcuts = {}
+        
+        # System audio dialog, built on first open and hidden when closed
+        self.system_audio_dialog = None
+        
+        # Pending debounced statistics update (after() id)
+        self.stats_after_id = None
+        
+        # Word counting runs on a worker thread: text snapshots go in (only the
+        # newest is kept), (version, words, chars) results come back and are
+        # applied by the polling loop. Results for an older version are dropped.
+        self.stats_requests = queue.Queue(maxsize=1)
+        self.stats_results = queue.SimpleQueue()
+        self.stats_version = 0
+        self.stats_pending = False
+        
+        # Set when a count was skipped because the status bar was hidden
+        self.stats_deferred = False
+        threading.Thread(target=self.statistics_worker, daemon=True).start()
+        
+        # Set when the text changes; key releases without an edit skip the statistics
+        self.text_changed = False
+        
+        # Audio components, created on first use (see load_audio)
+        self.audio_recorder = None
+        self.system_audio_capture = None
+        
         # First run - check if API key is configured
         if not self.settings_manager.get_api_key():
             self.show_api_key_setup()
         else:
             self.setup_main_interface()
     
+    def new_main_frame(self):
+        """Replace the main frame with an empty one."""
+        # Destroying the frame tears down the previous screen in one call
+        if self.main_frame is not None:
+            self.main_frame.destroy()
+            
+        self.main_frame = tk.Frame(self.root, bg=self.theme["bg_color"])
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+    
     def show_api_key_setup(self):
         """Show initial API key setup screen before loading main interface."""
         # Clear any existing content
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
+        self.new_main_frame()
         
-        self.main_frame.pack(fill=tk.BOTH, expand=True)
+        theme = self.theme
+        
+        # Shared colour options for every label and frame on this screen
+        colors = {"bg": theme["bg_color"], "fg": theme["text_color"]}
+        frame_bg = {"bg": theme["bg_color"]}
         
         # Create a centered setup container
-        setup_frame = tk.Frame(self.main_frame, bg=self.bg_color, padx=40, pady=40)
+        setup_frame = tk.Frame(self.main_frame, padx=40, pady=40, **frame_bg)
         setup_frame.place(relx=0.5, rely=0.5, anchor='center')
         
         # Add welcome message
@@ -97,8 +243,7 @@ class TextEditorApp:
             setup_frame,
             text="Welcome to Modern Text Editor",
             font=("Calibri", 16, "bold"),
-            bg=self.bg_color,
-            fg=self.text_color
+            **colors
         )
         title_label.pack(pady=(0, 20))
         
@@ -111,15 +256,14 @@ class TextEditorApp:
             setup_frame,
             text=info_text,
             font=("Calibri", 11),
-            bg=self.bg_color,
-            fg=self.text_color,
             justify=tk.LEFT,
-            wraplength=400
+            wraplength=400,
+            **colors
         )
         info_label.pack(pady=(0, 30))
         
         # API Key entry
-        key_frame = tk.Frame(setup_frame, bg=self.bg_color)
+        key_frame = tk.Frame(setup_frame, **frame_bg)
         key_frame.pack(fill=tk.X, pady=(0, 30))
         
         self.api_key_var = tk.StringVar()
@@ -127,9 +271,8 @@ class TextEditorApp:
         key_label = tk.Label(
             key_frame,
             text="OpenAI API Key:",
-            bg=self.bg_color,
-            fg=self.text_color,
-            font=("Calibri", 11)
+            font=("Calibri", 11),
+            **colors
         )
         key_label.pack(anchor='w', pady=(0, 5))
         
@@ -159,10 +302,9 @@ class TextEditorApp:
             text="Show key",
             variable=show_var,
             command=toggle_show,
-            bg=self.bg_color,
-            fg=self.text_color,
-            activebackground=self.bg_color,
-            selectcolor=self.bg_color
+            activebackground=theme["bg_color"],
+            selectcolor=theme["bg_color"],
+            **colors
         )
         show_check.pack(anchor='w', pady=(5, 0))
         
@@ -171,15 +313,14 @@ class TextEditorApp:
             setup_frame,
             text="You can skip this step, but speech-to-text features won't be available.",
             font=("Calibri", 9),
-            bg=self.bg_color,
-            fg=self.text_color,
             justify=tk.LEFT,
-            wraplength=400
+            wraplength=400,
+            **colors
         )
         skip_info.pack(pady=(0, 10))
         
         # Buttons
-        button_frame = tk.Frame(setup_frame, bg=self.bg_color)
+        button_frame = tk.Frame(setup_frame, **frame_bg)
         button_frame.pack(fill=tk.X, pady=(10, 0))
         
         # Style for buttons
@@ -197,7 +338,7 @@ class TextEditorApp:
             button_frame,
             text="Continue with API Key",
             command=self.save_initial_api_key,
-            bg=self.accent_color,
+            bg=theme["accent_color"],
             fg="white",
             relief=tk.FLAT,
             **button_style
@@ -209,8 +350,8 @@ class TextEditorApp:
             button_frame,
             text="Skip for Now",
             command=self.skip_api_key,
-            bg=self.button_bg,
-            fg=self.accent_color,
+            bg=theme["button_bg"],
+            fg=theme["accent_color"],
             relief=tk.FLAT,
             **button_style
         )
@@ -231,21 +372,13 @@ class TextEditorApp:
     def setup_main_interface(self):
         """Set up the main editor interface."""
         # Clear any existing content
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
+        self.new_main_frame()
         
         # Create menu bar
         self.create_menu_bar()
         
         # Create toolbar with formatting options
-        format_callbacks = {
-            'apply_font': self.apply_font,
-            'toggle_bold': self.toggle_bold,
-            'toggle_italic': self.toggle_italic,
-            'toggle_underline': self.toggle_underline,
-            'set_alignment': self.set_alignment,
-            'start_transcription': self.start_transcription
-        }
+        format_callbacks = {name: getattr(self, name) for name in self.FORMAT_CALLBACK_NAMES}
         self.toolbar_manager = ToolbarManager(
             self.main_frame, 
             self.theme, 
@@ -255,49 +388,36 @@ class TextEditorApp:
         
         # Create document area (page, text widget, rulers)
         self.document_manager = DocumentManager(self.main_frame, self.theme)
+        self.text_widget = self.document_manager.text_widget
         
         # Now we can set the text widget for the toolbar
-        self.toolbar_manager.text_widget = self.document_manager.text_widget
+        self.toolbar_manager.text_widget = self.text_widget
         
         # Create status bar
         self.statusbar_manager = StatusBarManager(self.main_frame, self.theme)
+        self.statusbar_manager.status_frame.bind("<Map>", self.on_statusbar_shown, add="+")
         
         # Create text formatter
         self.text_formatter = TextFormatter(
-            self.document_manager.text_widget,
+            self.text_widget,
             self.update_status
         )
         
         # Create text searcher
         self.text_searcher = TextSearcher(
-            self.document_manager.text_widget,
+            self.text_widget,
             self.update_status
         )
         
         # Create document statistics
-        self.document_statistics = DocumentStatistics(self.document_manager.text_widget)
+        self.document_statistics = DocumentStatistics(self.text_widget)
         
         # Create file operations
         self.file_operations = FileOperations(
-            self.document_manager.text_widget,
+            self.text_widget,
             self.update_title,
-            self.update_status
-        )
-        
-        # Initialize audio recorder with callbacks
-        self.audio_recorder = AudioRecorder(
-            self.settings_manager,
-            status_callback=self.update_status,
-            transcription_callback=self.add_transcribed_text
-        )
-
-        # Initialize system audio capture
-        self.system_audio_capture = SystemAudioCapture(
-            self.settings_manager,
-            self.audio_recorder.transcription_service,
-            status_callback=self.update_status,
-            text_callback=self.add_transcribed_text,
-            continuous_mode=self.settings_manager.get_setting("continuous_transcription", False)
+            self.update_status,
+            modified_callback=self.on_text_modified
         )
         
         # Setup keyboard shortcuts
@@ -306,11 +426,14 @@ class TextEditorApp:
         # Bind events
         self.bind_events()
         
+        # Start delivering transcribed text and statistics from the worker threads
+        self.root.after(50, self.drain_text_queue)
+        
         # Update statistics
         self.update_statistics()
         
         # Set focus to text widget
-        self.document_manager.text_widget.focus_set()
+        self.text_widget.focus_set()
     
     def create_menu_bar(self):
         """Create the main menu bar."""
@@ -330,8 +453,8 @@ class TextEditorApp:
         
         # Edit menu
         edit_menu = tk.Menu(menu_bar, tearoff=0)
-        edit_menu.add_command(label="Undo", command=lambda: self.document_manager.text_widget.event_generate("<<Undo>>"))
-        edit_menu.add_command(label="Redo", command=lambda: self.document_manager.text_widget.event_generate("<<Redo>>"))
+        edit_menu.add_command(label="Undo", command=lambda: self.text_widget.event_generate("<<Undo>>"))
+        edit_menu.add_command(label="Redo", command=lambda: self.text_widget.event_generate("<<Redo>>"))
         edit_menu.add_separator()
         edit_menu.add_command(label="Cut", command=self.cut)
         edit_menu.add_command(label="Copy", command=self.copy)
@@ -390,29 +513,95 @@ class TextEditorApp:
     def bind_events(self):
         """Set up event bindings."""
         # Text widget events
-        self.document_manager.text_widget.bind("<KeyRelease>", self.handle_key_release)
-        self.document_manager.text_widget.bind("<Control-a>", self.select_all)
-        self.document_manager.text_widget.bind("<Control-f>", lambda event: self.show_find_dialog())
-        self.document_manager.text_widget.bind("<Control-h>", lambda event: self.show_replace_dialog())
+        self.text_widget.bind("<KeyRelease>", self.handle_key_release)
+        self.text_widget.bind("<Control-a>", self.select_all)
+        self.text_widget.bind("<Control-f>", lambda event: self.show_find_dialog())
+        self.text_widget.bind("<Control-h>", lambda event: self.show_replace_dialog())
         
         # Canvas events
         self.document_manager.document_canvas.bind("<Configure>", self.document_manager.on_canvas_configure)
         
         # Window events
-        self.root.bind("<FocusIn>", lambda event: self.document_manager.text_widget.focus_set())
+        self.root.bind("<FocusIn>", lambda event: self.text_widget.focus_set())
     
     def handle_key_release(self, event):
         """Handle key release events in the text widget."""
-        # Update word and character count
-        self.update_statistics()
+        # Navigation and modifier keys don't change the text
+        if not self.text_changed:
+            return
+        self.text_changed = False
+        
+        # Update word and character count once typing pauses
+        self.schedule_statistics_update()
+    
+    def on_text_modified(self):
+        """Record that the text changed (Tk's modified flag is owned by FileOperations)."""
+        self.text_changed = True
+    
+    def schedule_statistics_update(self, delay=250):
+        """Update document statistics after a quiet period instead of on every key."""
+        if self.stats_after_id is not None:
+            self.root.after_cancel(self.stats_after_id)
+        self.stats_after_id = self.root.after(delay, self.update_statistics)
     
     def update_statistics(self):
         """Update document statistics."""
-        # Get text content
-        text = self.document_manager.text_widget.get("1.0", "end-1c")
+        self.stats_after_id = None
+        
+        # Nobody sees the counts while the status bar is hidden, so don't
+        # snapshot or count the text until it is shown again (results still
+        # in flight are outdated, and inserts wait for the new count too)
+        if not self.statusbar_manager.visible:
+            self.stats_version += 1
+            self.stats_pending = True
+            self.stats_deferred = True
+            return
+        self.stats_deferred = False
         
-        # Update status bar 
-        self.statusbar_manager.update_statistics(text)
+        # Snapshot the text here (Tk is only touched on this thread) and let
+        # the worker count it
+        self.stats_version += 1
+        self.stats_pending = True
+        request = (self.stats_version, self.text_widget.get("1.0", "end-1c"))
+        
+        # Replace a snapshot the worker hasn't picked up yet
+        try:
+            self.stats_requests.get_nowait()
+        except queue.Empty:
+            pass
+        self.stats_requests.put(request)
+    
+    def on_statusbar_shown(self, event=None):
+        """Count the text that changed while the status bar was hidden."""
+        # (a scheduled update will count it anyway)
+        if self.stats_deferred and self.stats_after_id is None:
+            self.update_statistics()
+    
+    def statistics_worker(self):
+        """Count words and characters of text snapshots off the Tk thread."""
+        # Consecutive snapshots mostly differ by a small edit, so after the
+        # first full count only the changed span is rescanned
+        last_text = None
+        word_count = 0
+        while True:
+            version, text = self.stats_requests.get()
+            if last_text is None:
+                word_count = count_words(text)
+            else:
+                word_count = recount_words(last_text, word_count, text)
+            last_text = text
+            self.stats_results.put((version, word_count, len(text)))
+    
+    def apply_statistics_results(self):
+        """Show the newest statistics computed by the worker."""
+        while True:
+            try:
+                version, word_count, char_count = self.stats_results.get_nowait()
+            except queue.Empty:
+                return
+            if version == self.stats_version:
+                self.stats_pending = False
+                self.statusbar_manager.set_counts(word_count, char_count)
     
     def update_status(self, message):
         """Update the status bar message."""
@@ -427,18 +616,14 @@ class TextEditorApp:
         if self.theme_manager.set_current_theme(theme_name):
             self.theme = self.theme_manager.get_theme()
             
-            # Update theme variables on instance
-            for key, value in self.theme.items():
-                setattr(self, key, value)
-            
             # Update UI components
             self.document_manager.update_theme(self.theme)
             self.toolbar_manager.update_theme(self.theme)
             self.statusbar_manager.update_theme(self.theme)
             
             # Update root and main frame
-            self.root.configure(bg=self.bg_color)
-            self.main_frame.configure(bg=self.bg_color)
+            self.root.configure(bg=self.theme["bg_color"])
+            self.main_frame.configure(bg=self.theme["bg_color"])
             
             # Save theme setting
             self.settings_manager.update_setting("theme", theme_name)
@@ -488,60 +673,88 @@ class TextEditorApp:
     
     def print_document(self):
         """Print document functionality (placeholder)."""
-        self.update_status("Print feature is not implemented in this version")
+        self.update_status(PRINT_PLACEHOLDER_TEXT)
     
     def exit_app(self):
         """Exit the application."""
-        if self.file_operations.has_content() and tk.messagebox.askyesno("Save?", "Do you want to save your current work?"):
-            self.file_operations.save_file()
+        # Nothing can be unsaved before the main interface is set up
+        if (self.file_operations is not None and self.file_operations.is_dirty()
+                and tk.messagebox.askyesno("Save?", "Do you want to save your current work?")):
+            self.file_operations.save_file(wait=True)
         self.root.quit()
     
     # Edit operations
     def cut(self):
         """Cut selected text."""
-        if self.document_manager.text_widget.tag_ranges(tk.SEL):
-            self.copy()
-            self.document_manager.text_widget.delete(tk.SEL_FIRST, tk.SEL_LAST)
-            self.update_statistics()
+        # One range query, one get and one delete for the whole operation
+        text_widget = self.text_widget
+        selection = text_widget.tag_ranges(tk.SEL)
+        if not selection:
+            return
+            
+        start, end = selection[0], selection[1]
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text_widget.get(start, end))
+        text_widget.delete(start, end)
+        self.update_statistics()
     
     def copy(self):
         """Copy selected text."""
-        if self.document_manager.text_widget.tag_ranges(tk.SEL):
-            selected_text = self.document_manager.text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+        selection = self.text_widget.tag_ranges(tk.SEL)
+        if selection:
             self.root.clipboard_clear()
-            self.root.clipboard_append(selected_text)
+            self.root.clipboard_append(self.text_widget.get(selection[0], selection[1]))
     
     def paste(self):
         """Paste text from clipboard."""
         try:
             text = self.root.clipboard_get()
-            if self.document_manager.text_widget.tag_ranges(tk.SEL):
-                self.document_manager.text_widget.delete(tk.SEL_FIRST, tk.SEL_LAST)
-            self.document_manager.text_widget.insert(tk.INSERT, text)
+            text_widget = self.text_widget
+            if text_widget.tag_ranges(tk.SEL):
+                text_widget.delete(tk.SEL_FIRST, tk.SEL_LAST)
+            text_widget.insert(tk.INSERT, text)
             self.update_statistics()
         except tk.TclError:
             pass  # Clipboard is empty
     
     def select_all(self, event=None):
         """Select all text."""
-        self.document_manager.text_widget.tag_add(tk.SEL, "1.0", tk.END)
+        # The selection is one contiguous range, so tag it with a single Tcl
+        # call (without dispatching a virtual event to the class bindings);
+        # "end-1c" leaves out the newline Tk keeps after the last line
+        self.text_widget.tag_add(tk.SEL, "1.0", "end-1c")
         return "break"  # Prevent default handling
     
     # Dialog methods
+    def open_dialog(self, name):
+        """
+        Import a dialog module on first use and open the dialog.
+        
+        Args:
+            name: Key in LAZY_DIALOGS
+        """
+        module_name, class_name, display_name = LAZY_DIALOGS[name]
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+            self.update_status(f"{display_name} dialog will be implemented in the dialogs package")
+            return
+            
+        getattr(module, class_name)(self.root, self)
+    
     def show_find_dialog(self):
         """Show find dialog."""
-        # This would be implemented with a custom dialog, using the TextSearcher
-        self.update_status("Find dialog will be implemented in the dialogs package")
+        self.open_dialog("find")
     
     def show_replace_dialog(self):
         """Show replace dialog."""
-        # This would be implemented with a custom dialog, using the TextSearcher
-        self.update_status("Replace dialog will be implemented in the dialogs package")
+        self.open_dialog("replace")
     
     def show_font_dialog(self):
         """Show font selection dialog."""
-        # This would be implemented with a custom dialog
-        self.update_status("Font dialog will be implemented in the dialogs package")
+        self.open_dialog("font")
     
     def show_word_count(self):
         """Show detailed word count dialog."""
@@ -560,26 +773,19 @@ class TextEditorApp:
     
     def spell_check(self):
         """Basic spell check functionality (placeholder)."""
-        tk.messagebox.showinfo("Spell Check", "Spell check feature is not implemented in this version.")
+        tk.messagebox.showinfo("Spell Check", SPELL_CHECK_PLACEHOLDER_TEXT)
     
     def show_about(self):
         """Show about dialog."""
-        about_text = (
-            "Modern Text Editor\n\n"
-            "Version 1.0.0\n\n"
-            "A Microsoft Word-like text editor with A4 paper format.\n"
-            "Includes speech-to-text capabilities and basic text formatting."
-        )
-        tk.messagebox.showinfo("About", about_text)
+        tk.messagebox.showinfo("About", ABOUT_TEXT)
     
     def configure_api_key(self):
         """Configure the OpenAI API key."""
-        dialog = APIKeyDialog(
+        APIKeyDialog(
             self.root, 
             current_key=self.settings_manager.get_api_key(),
             save_callback=self.save_api_key
         )
-        self.root.wait_window(dialog)
     
     def save_api_key(self, api_key):
         """Save the API key."""
@@ -588,12 +794,11 @@ class TextEditorApp:
     
     def edit_shortcuts(self):
         """Edit keyboard shortcuts."""
-        dialog = ShortcutEditor(
+        ShortcutEditor(
             self.root,
             self.settings_manager.get_shortcuts(),
             self.save_shortcuts
         )
-        self.root.wait_window(dialog)
     
     def save_shortcuts(self, new_shortcuts):
         """Save keyboard shortcuts."""
@@ -618,7 +823,7 @@ class TextEditorApp:
             self.settings_manager.update_setting("chunk_duration", settings['chunk_duration'])
             
         # Update the system audio capture with new settings
-        if hasattr(self, 'system_audio_capture'):
+        if self.system_audio_capture is not None:
             # Update audio device if specified
             if 'audio_device_id' in settings and settings['audio_device_id'] is not None:
                 self.system_audio_capture.configure_device(settings['audio_device_id'])
@@ -638,42 +843,142 @@ class TextEditorApp:
     
     def configure_system_audio(self):
         """Open the system audio configuration dialog."""
-        dialog = SystemAudioDialog(
+        if self.system_audio_dialog is not None and self.system_audio_dialog.winfo_exists():
+            self.system_audio_dialog.show()
+            return
+            
+        if not self.load_audio():
+            return
+            
+        self.system_audio_dialog = SystemAudioDialog(
             self.root,
             self.system_audio_capture,
             self.settings_manager,
             save_callback=self.update_system_audio_settings
         )
-        self.root.wait_window(dialog)
     
     def setup_shortcuts(self):
         """Set up keyboard shortcuts."""
         shortcuts = self.settings_manager.get_shortcuts()
         
-        # Clear existing shortcuts
-        for shortcut in shortcuts.values():
+        # Only rebind the hotkeys that changed since the last call. A hotkey
+        # that can't be bound is skipped without affecting the others.
+        errors = []
+        for action, default, method_name, is_global, options in self.SHORTCUT_SPECS:
+            hotkey = shortcuts.get(action, default)
+            installed = self.installed_shortcuts.get(action)
+            if installed is not None and installed[0] == hotkey:
+                continue
+                
+            try:
+                if installed is not None:
+                    del self.installed_shortcuts[action]
+                    self.remove_shortcut(is_global, installed[1])
+                    
+                callback = getattr(self, method_name)
+                if is_global:
+                    # Imported on first use: loading keyboard installs OS-level hooks
+                    import keyboard
+                    handle = keyboard.add_hotkey(hotkey, callback, **options)
+                else:
+                    handle = self.bind_shortcut(hotkey, callback)
+                self.installed_shortcuts[action] = (hotkey, handle)
+            except Exception as e:
+                errors.append(f"{action} ({hotkey}): {e}")
+                
+        if errors:
+            tk.messagebox.showerror("Error", "Failed to setup shortcuts:\n" + "\n".join(errors))
+    
+    def bind_shortcut(self, hotkey, callback):
+        """
+        Bind an application shortcut with Tk.
+        
+        Args:
+            hotkey: Hotkey in keyboard module notation (e.g. "ctrl+s")
+            callback: Function to call when the shortcut is pressed
+            
+        Returns:
+            tuple: (sequence, text widget funcid, root funcid) for remove_shortcut
+        """
+        sequence = hotkey_to_sequence(hotkey)
+        
+        def handler(event):
+            callback()
+            return "break"  # Stop the Text class binding from handling the key too
+            
+        # The widget binding runs before the Text class bindings; the root
+        # binding covers the rest of the main window, but not dialogs (they
+        # are separate toplevels), so their entries keep their own keys.
+        # add="+" keeps any other binding on the same sequence.
+        text_funcid = self.text_widget.bind(sequence, handler, add="+")
+        root_funcid = self.root.bind(sequence, handler, add="+")
+        return sequence, text_funcid, root_funcid
+    
+    def remove_shortcut(self, is_global, handle):
+        """Remove a shortcut installed by setup_shortcuts."""
+        if is_global:
+            import keyboard
+            # Remove by the handle add_hotkey returned, not by the hotkey string
             try:
-                keyboard.remove_hotkey(shortcut)
-            except:
-                pass
+                keyboard.remove_hotkey(handle)
+            except KeyError:
+                pass  # Already removed by the keyboard module
+        else:
+            # Remove only this shortcut's callbacks from the sequence
+            sequence, text_funcid, root_funcid = handle
+            unbind_callback(self.text_widget, sequence, text_funcid)
+            unbind_callback(self.root, sequence, root_funcid)
+    
+    def load_audio(self):
+        """
+        Import the audio packages and create the audio components on first use.
         
-        # Set up new shortcuts
+        Returns:
+            bool: True if the audio components are available
+        """
+        if self.audio_recorder is not None:
+            return True
+            
         try:
-            keyboard.add_hotkey(shortcuts.get("transcribe", "f9"), self.start_transcription, trigger_on_release=False)
-            keyboard.add_hotkey(shortcuts.get("system_audio", "f10"), self.start_system_audio_capture, trigger_on_release=False)
-            keyboard.add_hotkey(shortcuts.get("cut", "ctrl+x"), self.cut)
-            keyboard.add_hotkey(shortcuts.get("copy", "ctrl+c"), self.copy)
-            keyboard.add_hotkey(shortcuts.get("paste", "ctrl+v"), self.paste)
-            keyboard.add_hotkey(shortcuts.get("save", "ctrl+s"), self.save_file)
-            keyboard.add_hotkey(shortcuts.get("open", "ctrl+o"), self.open_file)
-            keyboard.add_hotkey(shortcuts.get("new", "ctrl+n"), self.new_file)
-        except Exception as e:
-            tk.messagebox.showerror("Error", f"Failed to setup shortcuts: {e}")
+            from audio.recorder import AudioRecorder
+            from audio.system_capture import SystemAudioCapture
+            from audio.transcription import create_session
+        except ImportError as e:
+            tk.messagebox.showerror(
+                "Missing Packages",
+                f"Audio features are unavailable ({e}).\n\n"
+                "Please install the required packages with:\n"
+                "pip install requests keyboard pyaudio sounddevice numpy"
+            )
+            return False
+            
+        # Initialize audio recorder with callbacks
+        self.audio_recorder = AudioRecorder(
+            self.settings_manager,
+            status_callback=self.update_status,
+            transcription_callback=self.add_transcribed_text,
+            state_change_callback=self.on_recording_state_change,
+            session=create_session()
+        )
+
+        # Initialize system audio capture
+        self.system_audio_capture = SystemAudioCapture(
+            self.settings_manager,
+            self.audio_recorder.transcription_service,
+            status_callback=self.update_status,
+            text_callback=self.add_transcribed_text,
+            continuous_mode=self.settings_manager.get_setting("continuous_transcription", False)
+        )
+        
+        return True
     
     def start_transcription(self, reset_callback=None):
         """Start recording from the microphone for transcription."""
+        self.mic_reset_callback = reset_callback
+        
         api_key = self.settings_manager.get_api_key()
         if not api_key:
+            self.on_recording_state_change(False)
             tk.messagebox.showerror("Error", "Please configure your OpenAI API key first")
             self.configure_api_key()
             return
@@ -682,7 +987,15 @@ class TextEditorApp:
         self.update_status("Recording... (Hold the transcription key)")
         
         # Start recording
-        self.audio_recorder.start_microphone_transcription()
+        if not self.load_audio() or not self.audio_recorder.start_microphone_transcription():
+            self.on_recording_state_change(False)
+    
+    def on_recording_state_change(self, is_recording):
+        """Reset the microphone button once recording stops."""
+        if not is_recording and self.mic_reset_callback:
+            # The recorder notifies from its worker thread
+            self.root.after(0, self.mic_reset_callback)
+            self.mic_reset_callback = None
     
     def start_system_audio_capture(self):
         """Start capturing system audio."""
@@ -700,6 +1013,10 @@ class TextEditorApp:
                 "Enable it in Settings > System Audio Capture."
             )
             return
+            
+        if not self.load_audio():
+            return
+            
         # Get the keyboard shortcut for reference
         shortcut = self.settings_manager.get_shortcuts().get("system_audio", "F10")
         # Start the capture
@@ -713,9 +1030,36 @@ class TextEditorApp:
         self.audio_recorder.start_system_audio_capture()
     
     def add_transcribed_text(self, text):
-        """Add transcribed text at the current cursor position."""
-        self.document_manager.text_widget.insert(tk.INSERT, text)
-        self.update_statistics()
+        """Queue transcribed text for insertion at the current cursor position."""
+        # Called from worker threads, so only touch the queue here, never Tk
+        self.text_queue.put(text)
+    
+    def drain_text_queue(self):
+        """Insert all queued transcribed text with a single widget call and apply worker statistics."""
+        pieces = []
+        while True:
+            try:
+                pieces.append(self.text_queue.get_nowait())
+            except queue.Empty:
+                break
+                
+        if pieces:
+            text_widget = self.text_widget
+            text = "".join(pieces)
+            
+            # Adjust the statistics by the inserted text instead of rescanning the
+            # document, unless a worker count is in flight (it would overwrite the
+            # adjustment with counts from before the insert)
+            before = text_widget.get("insert-1c") if text_widget.compare(tk.INSERT, ">", "1.0") else ""
+            after = text_widget.get(tk.INSERT)
+            text_widget.insert(tk.INSERT, text)
+            if self.stats_pending:
+                self.update_statistics()
+            else:
+                self.statusbar_manager.add_inserted_text(text, before, after)
+            
+        self.apply_statistics_results()
+        self.root.after(50, self.drain_text_queue)
 
 
 def main():
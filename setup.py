@@ -35,7 +35,6 @@ setup(
     python_requires='>=3.7',
     install_requires=[
         "pyaudio>=0.2.11",
-        "pydub>=0.25.1",
         "sounddevice>=0.4.1",
         "keyboard>=0.13.5",
         "numpy>=1.19.5",
@@ -5,31 +5,77 @@ Handles basic editing operations (cut, copy, paste, select all, etc).
 
 import tkinter as tk
 
+# Large documents are inserted in pieces of this many characters
+INSERT_CHUNK_SIZE = 65536
+
+# Let Tk redraw after this many pieces
+CHUNKS_PER_REDRAW = 8
+
+# Mark placed at the insertion point by TextEditor.add_text. Marks have right
+# gravity by default, so after the insert it sits after the new text.
+ADD_TEXT_MARK = "add_text_end"
+
+def insert_chunked(text_widget, text, chunk_size=INSERT_CHUNK_SIZE):
+    """
+    Append text to the end of a text widget in pieces.
+    
+    Passing a multi-megabyte document as a single Tcl argument blocks the UI
+    while it is copied; smaller pieces with an occasional redraw keep the
+    window responsive during the load.
+    
+    Args:
+        text_widget: The tkinter Text widget
+        text (str): Text to insert
+        chunk_size (int): Number of characters per insert call
+    """
+    for chunk_number, start in enumerate(range(0, len(text), chunk_size)):
+        # Inserting at "end" lands before the widget's trailing newline
+        text_widget.insert(tk.END, text[start:start + chunk_size])
+        if chunk_number and chunk_number % CHUNKS_PER_REDRAW == 0:
+            text_widget.update_idletasks()
+
 class TextEditor:
-    def __init__(self, text_widget, root=None, update_callback=None):
+    def __init__(self, text_widget, root=None, update_callback=None, debounce_ms=200):
         self.text_widget = text_widget
         self.root = root
         self.update_callback = update_callback
         
+        # Coalesce bursts of edits into a single update callback
+        self.debounce_ms = debounce_ms
+        self._pending_update = None
+        
     def select_all(self, event=None):
         """Select all text."""
-        self.text_widget.tag_add(tk.SEL, "1.0", tk.END)
+        # The selection is one contiguous range, so tag it with a single Tcl
+        # call (without dispatching a virtual event to the class bindings);
+        # "end-1c" leaves out the newline Tk keeps after the last line
+        self.text_widget.tag_add(tk.SEL, "1.0", "end-1c")
         return "break"  # Prevent default handling
     
     def cut(self):
         """Cut selected text."""
-        if self.text_widget.tag_ranges(tk.SEL):
-            self.copy()
-            self.text_widget.delete(tk.SEL_FIRST, tk.SEL_LAST)
-            self._notify_update()
+        # One range query, one get and one delete for the whole operation
+        selection = self.text_widget.tag_ranges(tk.SEL)
+        if not selection:
+            return
+            
+        start, end = selection[0], selection[1]
+        if self.root:
+            self.root.clipboard_clear()
+            self.root.clipboard_append(self.text_widget.get(start, end))
+        self.text_widget.delete(start, end)
+        self._notify_update()
     
     def copy(self):
         """Copy selected text."""
-        if self.text_widget.tag_ranges(tk.SEL):
-            selected_text = self.text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
-            if self.root:
-                self.root.clipboard_clear()
-                self.root.clipboard_append(selected_text)
+        # Without a root there is no clipboard, so don't copy the selection out
+        if not self.root:
+            return
+            
+        selection = self.text_widget.tag_ranges(tk.SEL)
+        if selection:
+            self.root.clipboard_clear()
+            self.root.clipboard_append(self.text_widget.get(selection[0], selection[1]))
     
     def paste(self):
         """Paste text from clipboard."""
@@ -56,15 +102,16 @@ class TextEditor:
         Returns:
             str: New cursor position
         """
-        # Get the current index if position not specified
+        # Insert at the cursor if position not specified
         if position is None:
-            position = self.text_widget.index(tk.INSERT)
+            position = tk.INSERT
         
-        # Insert the text
-        self.text_widget.insert(position, text)
-        
-        # Calculate new cursor position
-        new_position = self.text_widget.index(f"{position}+{len(text)}c")
+        # Insert the text at a mark, which Tk clamps to the document and
+        # moves past the inserted text (characters outside the BMP count
+        # as two index positions in Tk 8.6, so len(text) can't be used)
+        self.text_widget.mark_set(ADD_TEXT_MARK, position)
+        self.text_widget.insert(ADD_TEXT_MARK, text)
+        new_position = self.text_widget.index(ADD_TEXT_MARK)
         
         # Notify of update
         self._notify_update()
@@ -86,10 +133,25 @@ class TextEditor:
     def set_all_text(self, text):
         """Set all text in editor."""
         self.text_widget.delete("1.0", tk.END)
-        self.text_widget.insert("1.0", text)
+        insert_chunked(self.text_widget, text)
         self._notify_update()
         
     def _notify_update(self):
-        """Notify callback of text update."""
-        if self.update_callback:
-            self.update_callback()
\ No newline at end of file
+        """Schedule the update callback, restarting the wait on every edit."""
+        if not self.update_callback:
+            return
+            
+        if self._pending_update is not None:
+            self.text_widget.after_cancel(self._pending_update)
+        self._pending_update = self.text_widget.after(self.debounce_ms, self._fire_update)
+        
+    def _fire_update(self):
+        """Run the scheduled update callback."""
+        self._pending_update = None
+        self.update_callback()
+        
+    def flush_pending_update(self):
+        """Run a scheduled update callback now (e.g. before saving)."""
+        if self._pending_update is not None:
+            self.text_widget.after_cancel(self._pending_update)
+            self._fire_update()
\ No newline at end of file
@@ -5,167 +5,247 @@ Text formatting functionality for the Word-Style TextEditor.
 import tkinter as tk
 from tkinter import messagebox, font
 
+# Marks bounding the highlighted search match. They move with edits like the
+# tag does, so the previous highlight can be removed with one bounded call.
+SEARCH_START_MARK = "search_start"
+SEARCH_END_MARK = "search_end"
+
+def init_search_marks(text_widget):
+    """Create the search match marks (an empty range at the start of the text)."""
+    text_widget.mark_set(SEARCH_START_MARK, "1.0")
+    text_widget.mark_set(SEARCH_END_MARK, "1.0")
+    # Text typed at either edge of the match stays outside it, as with the tag
+    text_widget.mark_gravity(SEARCH_START_MARK, tk.RIGHT)
+    text_widget.mark_gravity(SEARCH_END_MARK, tk.LEFT)
+
+def highlight_search_match(text_widget, start, end):
+    """Highlight a search match and remember its range in the search marks."""
+    text_widget.tag_add("search", start, end)
+    text_widget.mark_set(SEARCH_START_MARK, start)
+    text_widget.mark_set(SEARCH_END_MARK, end)
+
+def remove_search_highlight(text_widget):
+    """Remove the search highlight from the previously highlighted match only."""
+    text_widget.tag_remove("search", SEARCH_START_MARK, SEARCH_END_MARK)
+
+# Tcl procedure that finds every match with one "search -all" call and replaces
+# them from last to first, so the whole loop runs inside Tcl
+REPLACE_ALL_PROC = """
+namespace eval ::texxteditor {}
+proc ::texxteditor::replace_all {w pattern replacement nocase} {
+    set options [list -all -count lengths]
+    if {$nocase} {
+        lappend options -nocase
+    }
+    set indices [$w search {*}$options -- $pattern 1.0 end]
+    for {set i [expr {[llength $indices] - 1}]} {$i >= 0} {incr i -1} {
+        set index [lindex $indices $i]
+        $w replace $index "$index + [lindex $lengths $i] chars" $replacement
+    }
+    return [llength $indices]
+}
+"""
+
+def replace_all_in_widget(text_widget, search_text, replace_text, case_sensitive=False):
+    """
+    Replace every occurrence of search_text as a single undo step.
+    
+    The matches are found and replaced by REPLACE_ALL_PROC, which must have
+    been registered on the widget's interpreter.
+    
+    Returns:
+        int: Number of replacements made
+    """
+    # A needle without cased characters matches the same either way, so let
+    # Tk use its cheaper exact comparison
+    nocase = not case_sensitive and search_text.lower() != search_text.upper()
+    
+    # Only the highlighted match carries the search tag (see the search marks)
+    remove_search_highlight(text_widget)
+    
+    autoseparators = text_widget.cget("autoseparators")
+    text_widget.configure(autoseparators=False)
+    text_widget.edit_separator()
+    try:
+        return int(text_widget.tk.call(
+            "::texxteditor::replace_all", text_widget._w,
+            search_text, replace_text, 1 if nocase else 0
+        ))
+    finally:
+        text_widget.edit_separator()
+        text_widget.configure(autoseparators=autoseparators)
+
 class TextFormatter:
     def __init__(self, text_widget, update_status_callback=None):
         self.text_widget = text_widget
         self.update_status = update_status_callback
         
+        # Font tags created by apply_font: tag name -> font.Font
+        # (keeping the Font objects alive also keeps the Tcl fonts alive)
+        self.font_tags = {}
+        
+        # Family and size of each font tag (tag name -> (family, size)), so
+        # get_font_metrics never has to parse tag names
+        self.font_meta = {}
+        
+        # Family and size of the widget's own font, used where no font tag applies
+        widget_font = font.Font(font=self.text_widget.cget("font"))
+        self.default_font = (widget_font.actual("family"), widget_font.actual("size"))
+        
         # Configure tags for formatting
         self.configure_tags()
+        init_search_marks(self.text_widget)
     
     def configure_tags(self):
-        """Configure text formatting tags."""
-        # Base formatting tags - use font.Font instead of tuples with None
-        bold_font = font.Font(self.text_widget, self.text_widget.cget("font"))
-        bold_font.configure(weight="bold")
-        self.text_widget.tag_configure("bold", font=bold_font)
+        """Create the text formatting tags (each is styled on first use)."""
+        # Tag name -> tag options; a "font" entry holds options applied to a
+        # copy of the widget's font (font.Font instead of tuples with None)
+        self.tag_options = {
+            "bold": {"font": {"weight": "bold"}},
+            "italic": {"font": {"slant": "italic"}},
+            # Underline doesn't need a font change, just the underline property
+            "underline": {"underline": True},
+            # Alignment tags
+            "left": {"justify": tk.LEFT},
+            "center": {"justify": tk.CENTER},
+            "right": {"justify": tk.RIGHT},
+            # Search highlighting
+            "search": {"background": "yellow"}
+        }
+        self.configured_tags = set()
         
-        italic_font = font.Font(self.text_widget, self.text_widget.cget("font"))
-        italic_font.configure(slant="italic")
-        self.text_widget.tag_configure("italic", font=italic_font)
+        # Tk ranks tags by creation order, so create them all now, unstyled:
+        # font tags made later by apply_font must keep priority over bold
+        # and italic, whenever those are first used
+        for name in self.tag_options:
+            self.text_widget.tag_configure(name)
         
-        # Underline doesn't need a font change, just the underline property
-        self.text_widget.tag_configure("underline", underline=True)
+        # Fonts of the configured tags, kept alive while the tags use them
+        self.tag_fonts = {}
         
-        # Alignment tags
-        self.text_widget.tag_configure("left", justify=tk.LEFT)
-        self.text_widget.tag_configure("center", justify=tk.CENTER)
-        self.text_widget.tag_configure("right", justify=tk.RIGHT)
+        # Register the Tcl side of replace_all
+        self.text_widget.tk.eval(REPLACE_ALL_PROC)
         
-        # Search highlighting
-        self.text_widget.tag_configure("search", background="yellow")
+    def _ensure_tag(self, name):
+        """Configure a formatting tag the first time it is used."""
+        if name in self.configured_tags or name not in self.tag_options:
+            return
+            
+        options = dict(self.tag_options[name])
+        if "font" in options:
+            tag_font = font.Font(self.text_widget, self.text_widget.cget("font"))
+            tag_font.configure(**options["font"])
+            self.tag_fonts[name] = options["font"] = tag_font
+            
+        self.text_widget.tag_configure(name, **options)
+        self.configured_tags.add(name)
     
     def update_status_message(self, message):
         """Update status message if callback is available."""
         if self.update_status:
             self.update_status(message)
     
+    def _selection_range(self):
+        """
+        Get the selection as a (start, end) pair of indices.
+        
+        The range is resolved once so the tag lookups and edits that follow
+        don't each make Tk resolve sel.first and sel.last again.
+        
+        Returns:
+            tuple: (start, end), or None if nothing is selected
+        """
+        selection = self.text_widget.tag_ranges(tk.SEL)
+        return (selection[0], selection[1]) if selection else None
+        
     def apply_font(self, family, size):
         """Apply selected font to text."""
-        if not self.text_widget.tag_ranges(tk.SEL):
+        selection = self._selection_range()
+        if not selection:
             self.update_status_message("Please select text first")
             return False
             
-        # Create new font tag
+        # Create the font tag the first time this font is used
         tag_name = f"font-{family}-{size}"
-        
-        # Check if this tag already exists
-        try:
-            existing_font = self.text_widget.tag_cget(tag_name, "font")
-            if not existing_font:
-                # Create a new font object
-                custom_font = font.Font(family=family, size=size)
-                self.text_widget.tag_configure(tag_name, font=custom_font)
-        except tk.TclError:
-            # Tag doesn't exist yet, create it
+        if tag_name not in self.font_tags:
             custom_font = font.Font(family=family, size=size)
             self.text_widget.tag_configure(tag_name, font=custom_font)
+            self.font_tags[tag_name] = custom_font
+            self.font_meta[tag_name] = (family, size)
         
-        # Apply to selected text
-        current_tags = self.text_widget.tag_names(tk.SEL_FIRST)
-        
-        # Remove any existing font tags
-        for tag in current_tags:
-            if tag.startswith("font-"):
-                self.text_widget.tag_remove(tag, tk.SEL_FIRST, tk.SEL_LAST)
+        # Remove any existing font tags from the selection
+        start, end = selection
+        current_tags = self.text_widget.tag_names(start)
+        for tag in self.font_tags.keys() & current_tags:
+            self.text_widget.tag_remove(tag, start, end)
         
         # Add the new font tag
-        self.text_widget.tag_add(tag_name, tk.SEL_FIRST, tk.SEL_LAST)
+        self.text_widget.tag_add(tag_name, start, end)
         
         self.update_status_message(f"Font applied: {family}, {size}pt")
         return True
     
-    def toggle_bold(self):
-        """Toggle bold formatting on selected text."""
-        if not self.text_widget.tag_ranges(tk.SEL):
+    def _toggle_tag(self, tag, label):
+        """Add a formatting tag to the selection, or remove it if already applied."""
+        selection = self._selection_range()
+        if not selection:
             self.update_status_message("Please select text first")
             return False
             
-        # Check if selection already has bold tag
-        current_tags = self.text_widget.tag_names(tk.SEL_FIRST)
+        # Check if selection already has the tag (one Tcl call, set lookup)
+        start, end = selection
+        current_tags = frozenset(self.text_widget.tag_names(start))
         
-        if "bold" in current_tags:
-            # Remove bold
-            self.text_widget.tag_remove("bold", tk.SEL_FIRST, tk.SEL_LAST)
-            self.update_status_message("Bold removed")
+        if tag in current_tags:
+            self.text_widget.tag_remove(tag, start, end)
+            self.update_status_message(f"{label} removed")
         else:
-            # Apply bold
-            self.text_widget.tag_add("bold", tk.SEL_FIRST, tk.SEL_LAST)
-            self.update_status_message("Bold applied")
+            self._ensure_tag(tag)
+            self.text_widget.tag_add(tag, start, end)
+            self.update_status_message(f"{label} applied")
             
         return True
     
+    def toggle_bold(self):
+        """Toggle bold formatting on selected text."""
+        return self._toggle_tag("bold", "Bold")
+    
     def toggle_italic(self):
         """Toggle italic formatting on selected text."""
-        if not self.text_widget.tag_ranges(tk.SEL):
-            self.update_status_message("Please select text first")
-            return False
-            
-        # Check if selection already has italic tag
-        current_tags = self.text_widget.tag_names(tk.SEL_FIRST)
-        
-        if "italic" in current_tags:
-            # Remove italic
-            self.text_widget.tag_remove("italic", tk.SEL_FIRST, tk.SEL_LAST)
-            self.update_status_message("Italic removed")
-        else:
-            # Apply italic
-            self.text_widget.tag_add("italic", tk.SEL_FIRST, tk.SEL_LAST)
-            self.update_status_message("Italic applied")
-            
-        return True
+        return self._toggle_tag("italic", "Italic")
     
     def toggle_underline(self):
         """Toggle underline formatting on selected text."""
-        if not self.text_widget.tag_ranges(tk.SEL):
-            self.update_status_message("Please select text first")
-            return False
-            
-        # Check if selection already has underline tag
-        current_tags = self.text_widget.tag_names(tk.SEL_FIRST)
-        
-        if "underline" in current_tags:
-            # Remove underline
-            self.text_widget.tag_remove("underline", tk.SEL_FIRST, tk.SEL_LAST)
-            self.update_status_message("Underline removed")
-        else:
-            # Apply underline
-            self.text_widget.tag_add("underline", tk.SEL_FIRST, tk.SEL_LAST)
-            self.update_status_message("Underline applied")
-            
-        return True
+        return self._toggle_tag("underline", "Underline")
     
     def set_alignment(self, alignment):
         """Set text alignment for the paragraph."""
-        # First remove any existing alignment tags from the selected text
-        for tag in ["left", "center", "right"]:
-            if self.text_widget.tag_ranges(tk.SEL):
-                self.text_widget.tag_remove(tag, tk.SEL_FIRST, tk.SEL_LAST)
-            else:
-                # Get the current paragraph if no selection
-                current_line = self.text_widget.index(tk.INSERT).split('.')[0]
-                start = f"{current_line}.0"
-                end = f"{current_line}.end"
-                self.text_widget.tag_remove(tag, start, end)
-        
-        # Apply the requested alignment
-        if self.text_widget.tag_ranges(tk.SEL):
-            # Apply to selected text
-            self.text_widget.tag_add(alignment, tk.SEL_FIRST, tk.SEL_LAST)
+        # Resolve the target range once: the selection, or the current paragraph
+        selection = self._selection_range()
+        if selection:
+            start, end = selection
         else:
-            # Apply to current paragraph
-            current_line = self.text_widget.index(tk.INSERT).split('.')[0]
+            current_line = self.text_widget.index(tk.INSERT).split('.', 1)[0]
             start = f"{current_line}.0"
             end = f"{current_line}.end"
-            self.text_widget.tag_add(alignment, start, end)
+            
+        # Replace any existing alignment with the requested one
+        for tag in ("left", "center", "right"):
+            self.text_widget.tag_remove(tag, start, end)
+        self._ensure_tag(alignment)
+        self.text_widget.tag_add(alignment, start, end)
             
         self.update_status_message(f"{alignment.capitalize()} alignment applied")
         return True
     
+    def clear_search_highlight(self):
+        """Remove the search highlight from the whole document."""
+        self.text_widget.tag_remove("search", "1.0", tk.END)
+        
     def find_text(self, search_text, case_sensitive=False, start_position=None):
         """Find text in the document."""
         # Remove existing search highlights
-        self.text_widget.tag_remove("search", "1.0", tk.END)
+        remove_search_highlight(self.text_widget)
         
         if not search_text:
             return False
@@ -189,7 +269,8 @@ class TextFormatter:
             end_position = f"{position}+{len(search_text)}c"
             
             # Highlight the found text
-            self.text_widget.tag_add("search", position, end_position)
+            self._ensure_tag("search")
+            highlight_search_match(self.text_widget, position, end_position)
             
             # Move cursor and ensure visibility
             self.text_widget.mark_set(tk.INSERT, end_position)
@@ -208,7 +289,8 @@ class TextFormatter:
                 end_position = f"{position}+{len(search_text)}c"
                 
                 # Highlight the found text
-                self.text_widget.tag_add("search", position, end_position)
+                self._ensure_tag("search")
+                highlight_search_match(self.text_widget, position, end_position)
                 
                 # Move cursor and ensure visibility
                 self.text_widget.mark_set(tk.INSERT, end_position)
@@ -222,60 +304,36 @@ class TextFormatter:
     
     def replace_text(self, search_text, replace_text, case_sensitive=False):
         """Replace the currently highlighted (searched) text."""
-        try:
-            # Check if we have a highlighted search
-            start_pos = self.text_widget.index("search.first")
-            end_pos = self.text_widget.index("search.last")
-            
-            # Replace the selected text
-            self.text_widget.delete(start_pos, end_pos)
-            self.text_widget.insert(start_pos, replace_text)
-            
-            # Update cursor position
-            self.text_widget.mark_set(tk.INSERT, f"{start_pos}+{len(replace_text)}c")
-            
-            # Find next occurrence
-            next_pos = self.find_text(search_text, case_sensitive)
-            
-            # Update status
-            self.update_status_message("Replaced")
-            return True
-            
-        except tk.TclError:
-            # No selection, find first
+        # The search marks bound the highlighted match and move with edits,
+        # so the highlight is found with one bounded lookup
+        match = self.text_widget.tag_nextrange("search", SEARCH_START_MARK, SEARCH_END_MARK)
+        if not match:
+            # No highlighted match, find first
             next_pos = self.find_text(search_text, case_sensitive)
             return next_pos is not False
+            
+        # Replace the highlighted text
+        start_pos, end_pos = match
+        self.text_widget.delete(start_pos, end_pos)
+        self.text_widget.insert(start_pos, replace_text)
+        
+        # Update cursor position
+        self.text_widget.mark_set(tk.INSERT, f"{start_pos}+{len(replace_text)}c")
+        
+        # Find next occurrence
+        next_pos = self.find_text(search_text, case_sensitive)
+        
+        # Update status
+        self.update_status_message("Replaced")
+        return True
     
     def replace_all(self, search_text, replace_text, case_sensitive=False):
         """Replace all occurrences of the search text."""
         if not search_text:
             return 0
             
-        # Start from the beginning
-        self.text_widget.mark_set(tk.INSERT, "1.0")
-        
-        count = 0
-        while True:
-            # Find next occurrence
-            position = self.find_text(search_text, case_sensitive)
-            if not position:
-                break
-                
-            # Replace it
-            try:
-                start_pos = self.text_widget.index("search.first")
-                end_pos = self.text_widget.index("search.last")
-                
-                self.text_widget.delete(start_pos, end_pos)
-                self.text_widget.insert(start_pos, replace_text)
-                
-                # Update cursor position
-                self.text_widget.mark_set(tk.INSERT, f"{start_pos}+{len(replace_text)}c")
-                
-                count += 1
-            except tk.TclError:
-                break
-                
+        count = replace_all_in_widget(self.text_widget, search_text, replace_text, case_sensitive)
+            
         # Update status
         self.update_status_message(f"Replaced {count} occurrences")
         return count
@@ -285,28 +343,13 @@ class TextFormatter:
         current_index = self.text_widget.index(tk.INSERT)
         tags = self.text_widget.tag_names(current_index)
         
-        # Find the font tag if it exists
-        font_family = None
-        font_size = None
-        
+        # Use the first font tag at the cursor, or the widget's font if there is none
+        font_family, font_size = self.default_font
         for tag in tags:
-            if tag.startswith("font-"):
-                parts = tag.split("-")
-                if len(parts) >= 3:
-                    font_family = parts[1]
-                    try:
-                        font_size = int(parts[2])
-                    except ValueError:
-                        pass
-                    break
-        
-        # Use default font if no specific font tag is applied
-        if not font_family:
-            current_font = font.Font(font=self.text_widget.cget("font"))
-            font_family = current_font.actual("family")
-        if not font_size:
-            current_font = font.Font(font=self.text_widget.cget("font"))
-            font_size = current_font.actual("size")
+            meta = self.font_meta.get(tag)
+            if meta:
+                font_family, font_size = meta
+                break
             
         # Check bold, italic, underline
         is_bold = "bold" in tags
@@ -331,17 +374,24 @@ class TextFormatter:
     
     def clear_formatting(self):
         """Clear all formatting from selected text."""
-        if not self.text_widget.tag_ranges(tk.SEL):
+        selection = self._selection_range()
+        if not selection:
             self.update_status_message("Please select text first")
             return False
             
-        # Get the selected text
-        selected_text = self.text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+        # Only tags that touch the selection need removing: those already on
+        # at its start plus any that begin inside it (one dump scan), instead
+        # of every tag ever defined on the widget
+        start, end = selection
+        present = set(self.text_widget.tag_names(start))
+        present.update(
+            value for key, value, index in self.text_widget.dump(start, end, tag=True)
+            if key == "tagon"
+        )
+        present.discard(tk.SEL)  # Keep the selection itself
         
-        # Remove all tags from the selection
-        for tag in self.text_widget.tag_names():
-            if tag != tk.SEL:  # Keep the selection itself
-                self.text_widget.tag_remove(tag, tk.SEL_FIRST, tk.SEL_LAST)
+        for tag in present:
+            self.text_widget.tag_remove(tag, start, end)
                 
         self.update_status_message("Formatting cleared")
         return True
\ No newline at end of file
@@ -2,8 +2,64 @@
 Text handling functionality for the TextEditor.
 """
 
+import bisect
+import functools
+import itertools
+import re
 import tkinter.font as tkFont
 
+# Font used for the text blocks
+BLOCK_FONT = ("Helvetica", 12)
+
+# Kana, CJK ideographs, Hangul and full-width forms. These scripts don't use
+# spaces between words, so a line may break before or after any of them.
+CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef"
+CJK_SEGMENT_RE = re.compile(f"[{CJK_CHARS}]|[^{CJK_CHARS}]+")
+
+def break_segments(paragraph):
+    """
+    Split a paragraph into the pieces a line may break between.
+    
+    Returns (separator, segment) pairs, where separator is the space before
+    the segment or "" for a break opportunity next to a CJK character.
+    """
+    segments = []
+    separator = ""
+    for word in paragraph.split(' '):
+        if word.isascii():
+            segments.append((separator, word))
+        else:
+            for segment in CJK_SEGMENT_RE.findall(word):
+                segments.append((separator, segment))
+                separator = ""
+        separator = " "
+    return segments
+
+class PrefixWidths:
+    """
+    Widths of the prefixes of a line, each measured the first time it is read.
+    
+    Lines outside the glyph table take a Tk measure call per prefix, so a
+    click (a binary search over this sequence) or a selection edge only
+    measures the prefixes it actually looks at.
+    """
+    
+    def __init__(self, line, measure):
+        self.line = line
+        self.measure = measure
+        self.widths = {}
+        
+    def __len__(self):
+        return len(self.line) + 1
+        
+    def __getitem__(self, end):
+        if end < 0:
+            end += len(self.line) + 1
+        width = self.widths.get(end)
+        if width is None:
+            width = self.widths[end] = self.measure(self.line[:end])
+        return width
+
 class TextHandler:
     def __init__(self, canvas, theme_manager):
         self.canvas = canvas
@@ -14,8 +70,18 @@ class TextHandler:
         self.block_width = 300  # Default width for text blocks
         self.line_wrap = True   # Enable line wrapping by default
         
-        # Text blocks storage
+        # Text blocks storage, in creation order and indexed by canvas item id
         self.text_blocks = []
+        self.text_blocks_by_id = {}
+        
+        # Blocks sorted by top edge as (y, creation order, id) keys, so a click
+        # only has to look at blocks that start above it
+        self.blocks_by_y = []
+        self.block_y_keys = {}
+        self.block_counter = itertools.count()
+        
+        # Ids of blocks with some non-whitespace text (the only ones that can be clicked)
+        self.non_empty_block_ids = set()
         
         # Active block information
         self.current_text_item = None
@@ -32,19 +98,60 @@ class TextHandler:
         # Cursor position
         self.cursor_x = 20
         self.cursor_y = 20
+        
+        # Block font, its line height and measurement caches, created once
+        # instead of on every keystroke
+        self.load_block_font(BLOCK_FONT)
+    
+    def load_block_font(self, font):
+        """Create the block font and the caches that depend on it."""
+        self.font_obj = tkFont.Font(font=font)
+        self.line_height = self.font_obj.metrics("linespace")
+        
+        # Memoized text widths in the block font (each measure is a Tcl call)
+        self.measure_tk = functools.lru_cache(maxsize=4096)(self.font_obj.measure)
+        
+        # Width of each printable ASCII character, indexed by character code,
+        # so most text is measured by adding up widths without calling Tcl
+        self.glyph_widths = [0] * 128
+        for code in range(32, 127):
+            self.glyph_widths[code] = self.font_obj.measure(chr(code))
+        
+        # Most recent wrap in the block font:
+        # (text, width, wrapped lines, index in text where each line starts)
+        self.last_wrap = ("", None, [""], [0])
+        
+        # Wrapped line count of the paragraphs before the cursor's paragraph:
+        # (text before the paragraph, wrap width, line count)
+        self.lines_before_paragraph = ("", None, 0)
+    
+    def set_block_font(self, font):
+        """Change the font of all text blocks."""
+        self.load_block_font(font)
+        
+        # Cached layouts were measured in the old font
+        for block in self.text_blocks:
+            block['layout'] = None
+            self.canvas.itemconfig(block['id'], font=self.font_obj)
     
     def update_theme(self, theme_name):
         """Update the theme."""
         self.theme = self.theme_manager.get_theme(theme_name)
         
         # Update text color for all text blocks
+        itemconfig = self.canvas.itemconfig
+        text_color = self.theme["text_color"]
         for block in self.text_blocks:
-            self.canvas.itemconfig(block['id'], fill=self.theme["text_color"])
+            itemconfig(block['id'], fill=text_color)
     
     def set_block_width(self, width):
         """Set the width for text blocks."""
         self.block_width = width
         
+        # Cached layouts were wrapped at the old width
+        for block in self.text_blocks:
+            block['layout'] = None
+            
         # Update all existing blocks if line wrap is enabled
         if self.line_wrap:
             for block in self.text_blocks:
@@ -54,8 +161,9 @@ class TextHandler:
         """Toggle line wrapping for text blocks."""
         self.line_wrap = enabled
         
-        # Update all existing blocks
+        # Update all existing blocks (and drop their cached layouts)
         for block in self.text_blocks:
+            block['layout'] = None
             if self.line_wrap:
                 self.canvas.itemconfig(block['id'], width=self.block_width)
             else:
@@ -75,60 +183,54 @@ class TextHandler:
             x, y, 
             text="", 
             anchor='nw', 
-            font=("Helvetica", 12), 
+            font=self.font_obj, 
             fill=self.theme["text_color"],
             width=self.block_width if self.line_wrap else 0  # Set width for wrapping
         )
-        self.text_blocks.append({'id': self.current_text_item, 'x': x, 'y': y, 'text': ""})
+        block = {'id': self.current_text_item, 'x': x, 'y': y, 'text': "", 'layout': None}
+        self.text_blocks.append(block)
+        self.text_blocks_by_id[self.current_text_item] = block
+        self._index_block_y(self.current_text_item, y, next(self.block_counter))
         
         # Return the cursor position to update in the main application
         return x, y
     
     def add_character(self, char):
         """Add a character at the current insertion point."""
+        return self.add_text(char)
+    
+    def add_text(self, text):
+        """Add a string of text at the current insertion point."""
+        if not text:
+            return self.cursor_x, self.cursor_y
+            
         if self.current_text_item is None:
             # Create a new text block if none is active
             self.create_new_text_block(self.cursor_x, self.cursor_y)
             
-        font_obj = tkFont.Font(font=("Helvetica", 12))
-        
-        # Insert character at current insertion point
-        self.current_text = self.current_text[:self.insertion_index] + char + self.current_text[self.insertion_index:]
-        self.insertion_index += len(char)
-        
-        # Update the text display with proper wrapping
-        self.canvas.itemconfig(
-            self.current_text_item, 
-            text=self.current_text,
-            width=self.block_width if self.line_wrap else 0
-        )
-        
-        # Update cursor position based on wrapped text
-        wrapped_lines = self.wrap_text_to_width(self.current_text[:self.insertion_index], self.block_width, font_obj)
-        line_number = len(wrapped_lines) - 1
-        last_line = wrapped_lines[-1]
+        # Insert the whole string at the current insertion point, so a paste
+        # costs one splice, one wrap and one canvas update; the text before the
+        # cursor is built once and reused for the wrap below
+        text_before_cursor = self.current_text[:self.insertion_index] + text
+        self.current_text = text_before_cursor + self.current_text[self.insertion_index:]
+        self.insertion_index += len(text)
+        
+        # Update the text display (the wrap width is set when the block is
+        # created and by set_block_width/toggle_line_wrap)
+        self.canvas.itemconfig(self.current_text_item, text=self.current_text)
         
         # Position cursor at the end of the wrapped line
-        new_x = self.current_block_start_x + font_obj.measure(last_line)
-        new_y = self.current_block_start_y + line_number * font_obj.metrics("linespace")
+        line_number, last_line = self.get_cursor_line(text_before_cursor)
+        new_x = self.current_block_start_x + self.measure(last_line)
+        new_y = self.current_block_start_y + line_number * self.line_height
         self.current_line_y = new_y
         
         # Update the block text in storage
-        for block in self.text_blocks:
-            if block['id'] == self.current_text_item:
-                block['text'] = self.current_text
-                break
+        self.set_block_text(self.current_text_item, self.current_text)
                 
         # Return the new cursor position
         return new_x, new_y
     
-    def add_text(self, text):
-        """Add a string of text at the current insertion point."""
-        new_x, new_y = self.cursor_x, self.cursor_y
-        for char in text:
-            new_x, new_y = self.add_character(char)
-        return new_x, new_y
-    
     def handle_backspace(self):
         """Handle backspace key press."""
         # If there's a selection, the selection handler will handle it
@@ -138,35 +240,22 @@ class TextHandler:
         if self.insertion_index <= 0 or self.current_text_item is None:
             return None, None
             
-        font_obj = tkFont.Font(font=("Helvetica", 12))
-        
         # Remove the character before cursor
-        self.current_text = self.current_text[:self.insertion_index - 1] + self.current_text[self.insertion_index:]
+        wrapped_text = self.current_text[:self.insertion_index - 1]
+        self.current_text = wrapped_text + self.current_text[self.insertion_index:]
         self.insertion_index -= 1
         
-        # Update text with wrapping
-        self.canvas.itemconfig(
-            self.current_text_item, 
-            text=self.current_text,
-            width=self.block_width if self.line_wrap else 0
-        )
-        
-        # Update cursor position based on wrapped text
-        wrapped_text = self.current_text[:self.insertion_index]
-        wrapped_lines = self.wrap_text_to_width(wrapped_text, self.block_width, font_obj)
-        line_number = len(wrapped_lines) - 1
-        last_line = wrapped_lines[-1] if wrapped_lines else ""
+        # Update text (the block already has its wrap width)
+        self.canvas.itemconfig(self.current_text_item, text=self.current_text)
         
         # Position cursor
-        new_x = self.current_block_start_x + font_obj.measure(last_line)
-        new_y = self.current_block_start_y + line_number * font_obj.metrics("linespace")
+        line_number, last_line = self.get_cursor_line(wrapped_text)
+        new_x = self.current_block_start_x + self.measure(last_line)
+        new_y = self.current_block_start_y + line_number * self.line_height
         self.current_line_y = new_y
         
         # Update block in storage
-        for block in self.text_blocks:
-            if block['id'] == self.current_text_item:
-                block['text'] = self.current_text
-                break
+        self.set_block_text(self.current_text_item, self.current_text)
                 
         # Return the new cursor position
         return new_x, new_y
@@ -182,22 +271,47 @@ class TextHandler:
         self.insertion_index = start
         
         self.canvas.itemconfig(self.current_text_item, text=self.current_text)
-        for block in self.text_blocks:
-            if block['id'] == self.current_text_item:
-                block['text'] = self.current_text
-                break
+        self.set_block_text(self.current_text_item, self.current_text)
                 
         # Update cursor position
         return self.update_cursor_after_text_change()
     
+    def get_cursor_line(self, text_before_cursor):
+        """
+        Get the wrapped line number of the cursor and the part of that line
+        before the cursor.
+        
+        Only the cursor's paragraph is wrapped. Paragraphs wrap independently,
+        so the line count of the ones before it is kept until that text changes.
+        """
+        width = self.block_width if self.line_wrap else 0
+        paragraph_start = text_before_cursor.rfind('\n') + 1
+        text_before_paragraph = text_before_cursor[:paragraph_start]
+        
+        cached_text, cached_width, line_number = self.lines_before_paragraph
+        if width != cached_width or text_before_paragraph != cached_text:
+            if not paragraph_start:
+                line_number = 0
+            elif width > 0:
+                # Leave out the newline ending the last paragraph, which would
+                # otherwise wrap to an extra empty line
+                line_number = len(self.wrap_lines(text_before_paragraph[:-1], width, self.measure)[0])
+            else:
+                line_number = text_before_paragraph.count('\n')
+            self.lines_before_paragraph = (text_before_paragraph, width, line_number)
+            
+        wrapped_lines = self.wrap_text_to_width(text_before_cursor[paragraph_start:], self.block_width, self.font_obj)
+        return line_number + len(wrapped_lines) - 1, wrapped_lines[-1]
+    
     def update_cursor_after_text_change(self):
         """Update cursor position after text has changed."""
-        font_obj = tkFont.Font(font=("Helvetica", 12))
-        lines = self.current_text[:self.insertion_index].split("\n")
-        line_number = len(lines) - 1
-        last_line = lines[-1] if lines else ""
-        new_x = self.current_block_start_x + font_obj.measure(last_line)
-        new_y = self.current_block_start_y + line_number * font_obj.metrics("linespace")
+        # Only the line count and the last line are needed, so don't split
+        # the whole prefix into a list
+        text_before_cursor = self.current_text[:self.insertion_index]
+        line_number = text_before_cursor.count("\n")
+        last_line = text_before_cursor[text_before_cursor.rfind("\n") + 1:]
+        new_x = self.current_block_start_x + self.measure(last_line)
+        new_y = self.current_block_start_y + line_number * self.line_height
         self.current_line_y = new_y
         return new_x, new_y
     
@@ -206,11 +320,14 @@ class TextHandler:
         if self.current_text_item is None:
             return None, None, None, None
             
-        font_obj = tkFont.Font(font=("Helvetica", 12))
-        wrapped_lines = self.wrap_text_to_width(self.current_text, self.block_width, font_obj)
+        # The block's cached layout stays valid until the next edit, so
+        # repeated cursor moves don't re-wrap the text
+        block = self.text_blocks_by_id[self.current_text_item]
+        wrapped_lines = self.get_block_layout(block)[0]
+        line_starts = block['line_starts']
         
         # Find current cursor position in wrapped text
-        current_pos = self.find_wrapped_position(wrapped_lines, self.insertion_index)
+        current_pos = self.find_wrapped_position(wrapped_lines, self.insertion_index, line_starts)
         line_num, char_pos = current_pos
         
         # Start selection if shift is pressed
@@ -232,13 +349,13 @@ class TextHandler:
                 # Move to same horizontal position in previous line
                 prev_line = wrapped_lines[line_num - 1]
                 char_pos = min(char_pos, len(prev_line))
-                self.insertion_index = self.find_actual_index(wrapped_lines, line_num - 1, char_pos)
+                self.insertion_index = self.find_actual_index(wrapped_lines, line_num - 1, char_pos, line_starts)
         elif direction == "Down":
             if line_num < len(wrapped_lines) - 1:
                 # Move to same horizontal position in next line
                 next_line = wrapped_lines[line_num + 1]
                 char_pos = min(char_pos, len(next_line))
-                self.insertion_index = self.find_actual_index(wrapped_lines, line_num + 1, char_pos)
+                self.insertion_index = self.find_actual_index(wrapped_lines, line_num + 1, char_pos, line_starts)
         
         # Update selection if shift is pressed
         if shift_pressed:
@@ -253,60 +370,151 @@ class TextHandler:
         
         return new_x, new_y, selection_start, selection_end
     
+    def measure(self, text):
+        """Get the width of text in the block font."""
+        # The block font has no kerning, so printable ASCII is the sum of its
+        # character widths; anything else goes to Tk
+        if text.isascii() and text.isprintable():
+            return sum(map(self.glyph_widths.__getitem__, text.encode('ascii')))
+        return self.measure_tk(text)
+    
+    def get_prefix_widths(self, line):
+        """
+        Get the width of every prefix of a line, from "" to the whole line.
+        
+        Returns a list, or for lines outside the glyph table a PrefixWidths
+        sequence that measures prefixes on demand.
+        """
+        if line.isascii() and line.isprintable():
+            # All prefix widths from the glyph table in one pass
+            glyph_widths = map(self.glyph_widths.__getitem__, line.encode('ascii'))
+            return [0] + list(itertools.accumulate(glyph_widths))
+        return PrefixWidths(line, self.measure)
+    
     def wrap_text_to_width(self, text, width, font_obj):
-        """Wrap text to fit within specified width."""
+        """
+        Wrap text to fit within specified width.
+        
+        The returned list may be shared with the wrap cache, so callers must
+        not modify it.
+        """
         if not text:
             return [""]
             
+        # Blocks are drawn with width=0 when line wrap is off, so only
+        # explicit line breaks split the text and nothing needs measuring
+        if width <= 0 or not self.line_wrap:
+            return text.split('\n')
+            
+        if font_obj is not self.font_obj:
+            return self.wrap_lines(text, width, font_obj.measure)[0]
+            
+        # Reuse the previous wrap in the block font. Greedy wrapping only
+        # changes lines from the edit onwards, so:
+        # - same text (cursor moves, clicks, redraws): reuse every line
+        # - text appended (typing): re-wrap from the start of the last line
+        # - text cut off at the end (backspace): re-wrap from the line before
+        #   the new end, which may take back a word that fits again
+        last_text, last_width, last_lines, last_starts = self.last_wrap
+        keep = 0
+        if width == last_width:
+            if text.startswith(last_text):
+                if len(text) == len(last_text):
+                    return last_lines
+                keep = len(last_lines) - 1
+            elif last_text.startswith(text):
+                keep = max(bisect.bisect_right(last_starts, len(text)) - 2, 0)
+                
+        start = last_starts[keep] if keep else 0
+        new_lines, new_starts = self.wrap_lines(text[start:], width, self.measure)
+        wrapped_lines = last_lines[:keep] + new_lines
+        line_starts = last_starts[:keep] + [start + line_start for line_start in new_starts]
+        
+        self.last_wrap = (text, width, wrapped_lines, line_starts)
+        return wrapped_lines
+    
+    def wrap_lines(self, text, width, measure):
+        """
+        Wrap text to fit within specified width using the given measure function.
+        
+        Returns the wrapped lines and the index in text where each one starts.
+        Lines break at spaces, which are dropped, and next to CJK characters,
+        where nothing is dropped.
+        """
+        space_width = measure(' ')
+        
         wrapped_lines = []
+        line_starts = []
+        paragraph_start = 0
         for paragraph in text.split('\n'):
+            line_start = paragraph_start
+            paragraph_start += len(paragraph) + 1
             if not paragraph:
                 wrapped_lines.append("")
+                line_starts.append(line_start)
                 continue
                 
-            words = paragraph.split(' ')
-            current_line = words[0]
+            segments = break_segments(paragraph)
+            current_line = segments[0][1]
+            line_width = measure(current_line)
+            position = line_start + len(current_line)
             
-            for word in words[1:]:
-                test_line = current_line + ' ' + word
-                if font_obj.measure(test_line) <= width:
-                    current_line = test_line
+            # Measure each segment once (cached) and add up the widths instead
+            # of measuring every growing candidate line
+            for separator, segment in segments[1:]:
+                segment_width = measure(segment)
+                gap = space_width if separator else 0
+                if line_width + gap + segment_width <= width:
+                    current_line = current_line + separator + segment
+                    line_width += gap + segment_width
                 else:
                     wrapped_lines.append(current_line)
-                    current_line = word
+                    line_starts.append(line_start)
+                    line_start = position + len(separator)
+                    current_line = segment
+                    line_width = segment_width
+                position += len(separator) + len(segment)
                     
             wrapped_lines.append(current_line)
+            line_starts.append(line_start)
             
-        return wrapped_lines
+        return wrapped_lines, line_starts
+    
+    def get_line_starts(self, wrapped_lines):
+        """Get the index in the original text where each wrapped line starts."""
+        # Lines from the last wrap already have their offsets
+        if wrapped_lines is self.last_wrap[2]:
+            return self.last_wrap[3]
+        # Otherwise assume each line is followed by one space or newline
+        return [0] + list(itertools.accumulate(len(line) + 1 for line in wrapped_lines[:-1]))
     
-    def find_wrapped_position(self, wrapped_lines, global_index):
+    def find_wrapped_position(self, wrapped_lines, global_index, line_starts=None):
         """Find (line, char) position in wrapped text from global index."""
-        current_idx = 0
-        for line_num, line in enumerate(wrapped_lines):
-            line_end_idx = current_idx + len(line)
-            if global_index <= line_end_idx:
-                return (line_num, global_index - current_idx)
-            # Move to next line, +1 for newline if not the last line
-            if line_num < len(wrapped_lines) - 1:
-                current_idx = line_end_idx + 1
-            else:
-                current_idx = line_end_idx
+        if not wrapped_lines:
+            return (-1, 0)
+            
+        # Last line starting at or before the index
+        if line_starts is None:
+            line_starts = self.get_line_starts(wrapped_lines)
+        line_num = bisect.bisect_right(line_starts, global_index) - 1
+        char_pos = global_index - line_starts[line_num]
+        
         # If we're at the end of text
-        return (len(wrapped_lines) - 1, len(wrapped_lines[-1]) if wrapped_lines else 0)
+        if char_pos > len(wrapped_lines[line_num]):
+            return (len(wrapped_lines) - 1, len(wrapped_lines[-1]))
+        return (line_num, char_pos)
     
-    def find_actual_index(self, wrapped_lines, line_index, char_index):
+    def find_actual_index(self, wrapped_lines, line_index, char_index, line_starts=None):
         """Convert wrapped text position to position in original text."""
-        # Count characters up to the requested line
-        char_count = 0
-        for i in range(line_index):
-            char_count += len(wrapped_lines[i])
-            # Account for space or newline that might have been at the end
-            if i < line_index - 1:
-                char_count += 1
-                
-        # Add the character index within the line
-        char_count += char_index
-        return char_count
+        if line_index == 0:
+            return char_index
+            
+        # Characters up to the requested line, without the space or newline
+        # just before it (there is none after a break next to a CJK character)
+        if line_starts is None:
+            line_starts = self.get_line_starts(wrapped_lines)
+        previous_end = line_starts[line_index - 1] + len(wrapped_lines[line_index - 1])
+        return previous_end + char_index
     
     def get_clicked_block_and_position(self, canvas_x, canvas_y):
         """
@@ -319,19 +527,17 @@ class TextHandler:
         Returns:
             tuple: (block, insertion_index, cursor_x, cursor_y)
         """
-        font_obj = tkFont.Font(font=("Helvetica", 12))
+        line_height = self.line_height
         clicked_block = None
         
-        # Calculate actual areas of existing blocks
-        for block in self.text_blocks:
-            # Skip empty blocks for selection
-            if not block['text'].strip():
+        # Only blocks whose top edge is at or above the click can contain it;
+        # check them in creation order so overlapping blocks resolve as before
+        for block in self.get_blocks_above(canvas_y):
+            # Skip blocks starting right of the click and empty blocks
+            if block['x'] > canvas_x or block['id'] not in self.non_empty_block_ids:
                 continue
                 
-            lines = self.wrap_text_to_width(block['text'], self.block_width, font_obj)
-            line_height = font_obj.metrics("linespace")
-            max_width = min(max((font_obj.measure(line) for line in lines), default=0), self.block_width)
-            total_height = len(lines) * line_height
+            lines, max_width, total_height = self.get_block_layout(block)
             
             if block['x'] <= canvas_x <= block['x'] + max_width and block['y'] <= canvas_y <= block['y'] + total_height:
                 clicked_block = block
@@ -346,8 +552,7 @@ class TextHandler:
         y0 = clicked_block['y']
         
         # Process wrapped text for proper cursor positioning
-        wrapped_lines = self.wrap_text_to_width(clicked_block['text'], self.block_width, font_obj)
-        line_height = font_obj.metrics("linespace")
+        wrapped_lines = self.get_block_layout(clicked_block)[0]
         
         # Find which line was clicked
         line_index = int((canvas_y - y0) // line_height)
@@ -356,37 +561,39 @@ class TextHandler:
             
         # Find character position in the wrapped text
         relative_x = canvas_x - x0
-        current_line = wrapped_lines[line_index]
-        char_index_in_line = 0
         
-        for i in range(len(current_line) + 1):
-            if font_obj.measure(current_line[:i]) > relative_x:
-                char_index_in_line = i - 1
-                break
-            else:
-                char_index_in_line = i
+        # Prefix widths grow with length, so the click lands after the last
+        # prefix that isn't wider than it
+        prefix_widths = self.get_line_prefix_widths(clicked_block, line_index)
+        char_index_in_line = bisect.bisect_right(prefix_widths, relative_x) - 1
+        line_x = prefix_widths[char_index_in_line]
                 
         # Convert wrapped line position to actual text index
         if line_index == 0:
             insertion_index = char_index_in_line
         else:
             # Calculate the actual character position in the original text
-            insertion_index = self.find_actual_index(wrapped_lines, line_index, char_index_in_line)
+            insertion_index = self.find_actual_index(
+                wrapped_lines, line_index, char_index_in_line, clicked_block['line_starts'])
             
         # Calculate cursor position
-        cursor_x = x0 + font_obj.measure(current_line[:char_index_in_line])
+        cursor_x = x0 + line_x
         cursor_y = y0 + line_index * line_height
         
         return clicked_block, insertion_index, cursor_x, cursor_y
     
     def delete_blocks(self, block_ids):
         """Delete blocks by their IDs."""
+        block_ids = set(block_ids)
         for block_id in block_ids:
             # Remove block from canvas
             self.canvas.delete(block_id)
+            self.text_blocks_by_id.pop(block_id, None)
+            self.non_empty_block_ids.discard(block_id)
+            self._unindex_block_y(block_id)
             
-            # Remove block from data
-            self.text_blocks = [b for b in self.text_blocks if b['id'] != block_id]
+        # Remove blocks from data in one pass
+        self.text_blocks = [b for b in self.text_blocks if b['id'] not in block_ids]
             
         # Reset current item if it was deleted
         if self.current_text_item in block_ids:
@@ -397,14 +604,96 @@ class TextHandler:
         """Get all text blocks."""
         return self.text_blocks
     
+    def set_block_text(self, block_id, text):
+        """Store a block's text and drop its cached layout."""
+        block = self.text_blocks_by_id[block_id]
+        block['text'] = text
+        block['layout'] = None
+        
+        if text and not text.isspace():
+            self.non_empty_block_ids.add(block_id)
+        else:
+            self.non_empty_block_ids.discard(block_id)
+            
+    def has_text(self, block_id):
+        """Check whether a block has any non-whitespace text."""
+        return block_id in self.non_empty_block_ids
+        
+    def get_block_layout(self, block):
+        """
+        Get a block's wrapped lines and size, computing them only after the
+        block's text, the block width or line wrapping changed.
+        
+        Returns:
+            tuple: (wrapped_lines, max_width, total_height)
+        """
+        if block['layout'] is None:
+            lines = self.wrap_text_to_width(block['text'], self.block_width, self.font_obj)
+            
+            # The width is capped at block_width, so stop measuring at the
+            # first line that reaches it (usually one of the first lines of a
+            # wrapped block)
+            max_width = 0
+            for line in lines:
+                max_width = max(max_width, self.measure(line))
+                if max_width >= self.block_width:
+                    max_width = self.block_width
+                    break
+            block['layout'] = (lines, max_width, len(lines) * self.line_height)
+            block['line_starts'] = self.get_line_starts(lines)
+            block['prefix_widths'] = {}
+        return block['layout']
+    
+    def get_line_prefix_widths(self, block, line_index):
+        """
+        Get the prefix widths of one of a block's wrapped lines, computed on
+        the first click on that line and kept until the block's layout changes.
+        """
+        lines = self.get_block_layout(block)[0]
+        prefix_widths = block['prefix_widths']
+        if line_index not in prefix_widths:
+            prefix_widths[line_index] = self.get_prefix_widths(lines[line_index])
+        return prefix_widths[line_index]
+    
+    def get_blocks_above(self, y):
+        """Get the blocks whose top edge is at or above y, in creation order."""
+        candidate_count = bisect.bisect_right(self.blocks_by_y, (y, float('inf')))
+        candidates = sorted(self.blocks_by_y[:candidate_count], key=lambda key: key[1])
+        return [self.text_blocks_by_id[key[2]] for key in candidates]
+    
+    def get_block(self, block_id):
+        """Get a text block by its canvas item id (None if there is no such block)."""
+        return self.text_blocks_by_id.get(block_id)
+    
+    def _index_block_y(self, block_id, y, order):
+        """Add a block to the y-sorted index."""
+        key = (y, order, block_id)
+        bisect.insort(self.blocks_by_y, key)
+        self.block_y_keys[block_id] = key
+        
+    def _unindex_block_y(self, block_id):
+        """Remove a block from the y-sorted index and return its creation order."""
+        key = self.block_y_keys.pop(block_id, None)
+        if key is None:
+            return None
+        del self.blocks_by_y[bisect.bisect_left(self.blocks_by_y, key)]
+        return key[1]
+    
     def update_block_position(self, block_id, new_x, new_y):
         """Update the position of a text block."""
-        for block in self.text_blocks:
-            if block['id'] == block_id:
-                # Update coordinates in data
-                block['x'] = new_x
-                block['y'] = new_y
-                
-                # Update canvas position
-                self.canvas.coords(block_id, new_x, new_y)
-                break
\ No newline at end of file
+        if self.set_block_position(block_id, new_x, new_y):
+            # Update canvas position
+            self.canvas.coords(block_id, new_x, new_y)
+            
+    def set_block_position(self, block_id, new_x, new_y):
+        """
+        Update a block's stored position for a canvas item that was already
+        moved. Returns False if there is no such block.
+        """
+        block = self.text_blocks_by_id.get(block_id)
+        if not block:
+            return False
+        block['x'] = new_x
+        block['y'] = new_y
+        self._index_block_y(block_id, new_y, self._unindex_block_y(block_id))
+        return True
\ No newline at end of file
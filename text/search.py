@@ -4,6 +4,11 @@ Search and replace functionality for the TextEditor.
 
 import tkinter as tk
 
+from text.formatter import (
+    REPLACE_ALL_PROC, replace_all_in_widget,
+    init_search_marks, highlight_search_match, remove_search_highlight
+)
+
 class TextSearcher:
     def __init__(self, text_widget, status_callback=None):
         self.text_widget = text_widget
@@ -12,11 +17,21 @@ class TextSearcher:
         # Configure search highlight tag
         self.text_widget.tag_configure("search", background="yellow")
         
+        # replace_all runs its find/replace loop in Tcl
+        self.text_widget.tk.eval(REPLACE_ALL_PROC)
+        
+        # Track the highlighted match so find_text only clears that range
+        init_search_marks(self.text_widget)
+        
     def update_status(self, message):
         """Update status bar message if callback provided."""
         if self.status_callback:
             self.status_callback(message)
             
+    def clear_search_highlight(self):
+        """Remove the search highlight from the whole document."""
+        self.text_widget.tag_remove("search", "1.0", tk.END)
+        
     def find_text(self, search_text, case_sensitive=False, start_pos=None):
         """
         Find text in the document.
@@ -30,7 +45,7 @@ class TextSearcher:
             bool: True if found, False otherwise
         """
         # Remove existing highlights
-        self.text_widget.tag_remove("search", "1.0", tk.END)
+        remove_search_highlight(self.text_widget)
         
         if not search_text:
             return False
@@ -54,7 +69,7 @@ class TextSearcher:
             end_pos = f"{found_pos}+{len(search_text)}c"
             
             # Select and highlight the text
-            self.text_widget.tag_add("search", found_pos, end_pos)
+            highlight_search_match(self.text_widget, found_pos, end_pos)
             self.text_widget.mark_set(tk.INSERT, end_pos)
             self.text_widget.see(found_pos)
             
@@ -74,7 +89,7 @@ class TextSearcher:
                     end_pos = f"{found_pos}+{len(search_text)}c"
                     
                     # Select and highlight the text
-                    self.text_widget.tag_add("search", found_pos, end_pos)
+                    highlight_search_match(self.text_widget, found_pos, end_pos)
                     self.text_widget.mark_set(tk.INSERT, end_pos)
                     self.text_widget.see(found_pos)
                     
@@ -96,24 +111,21 @@ class TextSearcher:
         Returns:
             bool: True if replaced, False otherwise
         """
-        try:
-            # Check if we have a search selection
-            start_pos = self.text_widget.index("search.first")
-            end_pos = self.text_widget.index("search.last")
-            
-            # Replace the selected text
-            self.text_widget.delete(start_pos, end_pos)
-            self.text_widget.insert(start_pos, replace_text)
-            self.text_widget.mark_set(tk.INSERT, f"{start_pos}+{len(replace_text)}c")
-            
-            # Update status
-            self.update_status("Replaced")
-            return True
-            
-        except tk.TclError:
-            # No selection
+        # Check if we have a search selection (one query instead of resolving
+        # search.first and search.last and catching the error)
+        ranges = self.text_widget.tag_ranges("search")
+        if not ranges:
             return False
             
+        # Replace the selected text with one widget call
+        start_pos, end_pos = ranges[0], ranges[-1]
+        self.text_widget.replace(start_pos, end_pos, replace_text)
+        self.text_widget.mark_set(tk.INSERT, f"{start_pos}+{len(replace_text)}c")
+        
+        # Update status
+        self.update_status("Replaced")
+        return True
+            
     def replace_all(self, search_text, replace_text, case_sensitive=False):
         """
         Replace all occurrences of search_text with replace_text.
@@ -126,20 +138,13 @@ class TextSearcher:
         Returns:
             int: Number of replacements made
         """
-        # Start from the beginning
-        self.text_widget.mark_set(tk.INSERT, "1.0")
-        
-        count = 0
-        while True:
-            # Find next occurrence
-            if not self.find_text(search_text, case_sensitive):
-                break
-                
-            # Replace it
-            if not self.replace_current(replace_text):
-                break
-                
-            count += 1
+        if not search_text:
+            return 0
+            
+        # One "search -all" pass in Tcl instead of a find_text/replace_current
+        # round trip per occurrence; replacing from the last match backwards
+        # also means a replacement containing the search text is never re-matched
+        count = replace_all_in_widget(self.text_widget, search_text, replace_text, case_sensitive)
             
         # Update status
         self.update_status(f"Replaced {count} occurrences")
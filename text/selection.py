@@ -2,7 +2,15 @@
 Selection handling for the TextEditor.
 """
 
-import tkinter.font as tkFont
+import bisect
+
+# Canvas tag on selected blocks and their outlines, so they move in one call
+SELECTED_TAG = "selected_block"
+
+# Canvas tags on the block selection outlines and the text selection
+# highlight rectangles, so each group is restyled or deleted in one call
+OUTLINE_TAG = "selection_outline"
+HIGHLIGHT_TAG = "selection_highlight"
 
 class SelectionHandler:
     def __init__(self, canvas, text_handler, theme_manager):
@@ -29,21 +37,39 @@ class SelectionHandler:
         self.move_start_x = 0
         self.move_start_y = 0
         
+        # Latest pointer position of a block drag not applied yet; motion
+        # events are coalesced into one move per Tk idle cycle
+        self.pending_move = None
+        self.move_after_id = None
+        
+        # Font used to measure blocks, shared with the text handler
+        self.block_font = text_handler.font_obj
+        
+    def update_font(self, font):
+        """Change the block font (and the font used to measure blocks)."""
+        self.text_handler.set_block_font(font)
+        self.block_font = self.text_handler.font_obj
+        
+    def get_block_size(self, block):
+        """Get the (width, height) of a block's wrapped text."""
+        lines, max_width, total_height = self.text_handler.get_block_layout(block)
+        return max_width, total_height
+        
     def update_theme(self, theme_name):
         """Update the theme."""
-        self.theme = self.theme_manager.get_theme(theme_name)
+        # The theme manager hands out the same dict per theme, so nothing
+        # changes if it's the one already applied
+        theme = self.theme_manager.get_theme(theme_name)
+        if theme is self.theme:
+            return
+        self.theme = theme
         
         # Update selection outlines
-        for block_id, outline_id in self.selection_outlines.items():
-            self.canvas.itemconfig(outline_id, outline=self.theme["selected_block_outline"])
+        self.canvas.itemconfig(OUTLINE_TAG, outline=self.theme["selected_block_outline"])
             
         # Update selection rectangles
         if self.selection_rect:
-            if isinstance(self.selection_rect, list):
-                for rect in self.selection_rect:
-                    self.canvas.itemconfig(rect, fill=self.theme["selection_color"])
-            else:
-                self.canvas.itemconfig(self.selection_rect, fill=self.theme["selection_color"])
+            self.canvas.itemconfig(HIGHLIGHT_TAG, fill=self.theme["selection_color"])
                 
         # Update window selection
         if self.window_selection_rect:
@@ -58,22 +84,14 @@ class SelectionHandler:
         self.selection_start_index = None
         self.selection_end_index = None
         if self.selection_rect:
-            if isinstance(self.selection_rect, list):
-                for rect in self.selection_rect:
-                    self.canvas.delete(rect)
-            else:
-                self.canvas.delete(self.selection_rect)
+            self.canvas.delete(HIGHLIGHT_TAG)
             self.selection_rect = None
     
     def draw_selection(self, current_text_item, current_text, block_start_x, block_start_y):
         """Draw text selection highlighting with support for wrapped text."""
         # Clear any existing selection highlight
         if self.selection_rect:
-            if isinstance(self.selection_rect, list):
-                for rect in self.selection_rect:
-                    self.canvas.delete(rect)
-            else:
-                self.canvas.delete(self.selection_rect)
+            self.canvas.delete(HIGHLIGHT_TAG)
             self.selection_rect = None
             
         if self.selection_start_index is None or self.selection_end_index is None:
@@ -87,20 +105,38 @@ class SelectionHandler:
         if start_idx == end_idx:
             return
             
-        font_obj = tkFont.Font(font=("Helvetica", 12))
-        block_width = self.text_handler.block_width
-        
-        # Get wrapped lines for proper highlighting
-        wrapped_lines = self.text_handler.wrap_text_to_width(current_text, block_width, font_obj)
-        line_height = font_obj.metrics("linespace")
+        # Get wrapped lines for proper highlighting; the block's cached layout
+        # also keeps each line's prefix widths between drag events
+        block = self.text_handler.get_block(current_text_item)
+        if block is not None and block['text'] != current_text:
+            block = None
+        if block is not None:
+            wrapped_lines = self.text_handler.get_block_layout(block)[0]
+        else:
+            wrapped_lines = self.text_handler.wrap_text_to_width(
+                current_text, self.text_handler.block_width, self.block_font)
+        line_height = self.text_handler.line_height
         
         # Find which wrapped lines contain our selection
         selection_rects = []
-        current_idx = 0
+        if block is not None:
+            line_starts = block['line_starts']
+        else:
+            line_starts = self.text_handler.get_line_starts(wrapped_lines)
+        
+        # Only lines starting before the selection's end, from the one
+        # holding its start, can overlap it
+        first_line = max(bisect.bisect_right(line_starts, start_idx) - 1, 0)
+        last_line = bisect.bisect_left(line_starts, end_idx)
         
-        for line_num, line in enumerate(wrapped_lines):
-            line_start_idx = current_idx
-            line_end_idx = current_idx + len(line)
+        fill = self.theme["selection_color"]
+        create_rectangle = self.canvas.create_rectangle
+        tag_lower = self.canvas.tag_lower
+        
+        for line_num in range(first_line, last_line):
+            line = wrapped_lines[line_num]
+            line_start_idx = line_starts[line_num]
+            line_end_idx = line_start_idx + len(line)
             
             # Check if this line contains any selected text
             if start_idx < line_end_idx and end_idx > line_start_idx:
@@ -109,25 +145,19 @@ class SelectionHandler:
                 sel_end_in_line = min(len(line), end_idx - line_start_idx)
                 
                 # Calculate positions
-                x0 = block_start_x + font_obj.measure(line[:sel_start_in_line])
-                x1 = block_start_x + font_obj.measure(line[:sel_end_in_line])
+                if block is not None:
+                    prefix_widths = self.text_handler.get_line_prefix_widths(block, line_num)
+                else:
+                    prefix_widths = self.text_handler.get_prefix_widths(line)
+                x0 = block_start_x + prefix_widths[sel_start_in_line]
+                x1 = block_start_x + prefix_widths[sel_end_in_line]
                 y0 = block_start_y + line_num * line_height
                 y1 = y0 + line_height
                 
                 # Create highlight rectangle
-                rect = self.canvas.create_rectangle(
-                    x0, y0, x1, y1,
-                    fill=self.theme["selection_color"],
-                    outline=""
-                )
+                rect = create_rectangle(x0, y0, x1, y1, fill=fill, outline="", tags=HIGHLIGHT_TAG)
                 selection_rects.append(rect)
-                self.canvas.tag_lower(rect, current_text_item)
-                
-            # Move to next line, +1 for newline if not the last line
-            if line_num < len(wrapped_lines) - 1:
-                current_idx = line_end_idx + 1
-            else:
-                current_idx = line_end_idx
+                tag_lower(rect, current_text_item)
                 
         self.selection_rect = selection_rects
         
@@ -137,34 +167,34 @@ class SelectionHandler:
         self.clear_selection()
         
         # Clear block selections
-        for outline_id in self.selection_outlines.values():
-            self.canvas.delete(outline_id)
+        self.canvas.delete(OUTLINE_TAG)
+        self.canvas.dtag(SELECTED_TAG, SELECTED_TAG)
             
         self.selected_blocks = []
         self.selection_outlines = {}
         
     def add_block_to_selection(self, block):
         """Add a block to the multi-selection."""
-        if block['id'] not in self.selected_blocks:
+        # selection_outlines has the same keys as selected_blocks, with a dict lookup
+        if block['id'] not in self.selection_outlines:
             self.selected_blocks.append(block['id'])
             
             # Create highlight rectangle around block
-            font_obj = tkFont.Font(font=("Helvetica", 12))
-            lines = self.text_handler.wrap_text_to_width(block['text'], self.text_handler.block_width, font_obj)
-            line_height = font_obj.metrics("linespace")
-            max_width = min(max((font_obj.measure(line) for line in lines), default=0), self.text_handler.block_width)
-            total_height = len(lines) * line_height
+            max_width, total_height = self.get_block_size(block)
+            x, y = block['x'], block['y']
             
             outline = self.canvas.create_rectangle(
-                block['x'] - 2, 
-                block['y'] - 2, 
-                block['x'] + max_width + 4, 
-                block['y'] + total_height + 2,
+                x - 2, 
+                y - 2, 
+                x + max_width + 4, 
+                y + total_height + 2,
                 outline=self.theme["selected_block_outline"],
                 width=2,
-                dash=(2, 2)
+                dash=(2, 2),
+                tags=(SELECTED_TAG, OUTLINE_TAG)
             )
             self.selection_outlines[block['id']] = outline
+            self.canvas.addtag_withtag(SELECTED_TAG, block['id'])
             
             # Ensure the outline is behind the text
             self.canvas.tag_lower(outline, block['id'])
@@ -206,23 +236,13 @@ class SelectionHandler:
             if y1 > y2:
                 y1, y2 = y2, y1
             
-            # Find all blocks within the selection rectangle
-            for block in self.text_handler.get_all_blocks():
-                # Skip empty blocks for selection
-                if not block['text'].strip():
-                    continue
-                    
-                font_obj = tkFont.Font(font=("Helvetica", 12))
-                lines = self.text_handler.wrap_text_to_width(block['text'], self.text_handler.block_width, font_obj)
-                line_height = font_obj.metrics("linespace")
-                max_width = min(max((font_obj.measure(line) for line in lines), default=0), self.text_handler.block_width)
-                total_height = len(lines) * line_height
-                
-                # Check if block is inside selection rectangle
-                if (x1 <= block['x'] <= x2 or x1 <= block['x'] + max_width <= x2 or
-                   (block['x'] <= x1 and block['x'] + max_width >= x2)) and \
-                   (y1 <= block['y'] <= y2 or y1 <= block['y'] + total_height <= y2 or
-                   (block['y'] <= y1 and block['y'] + total_height >= y2)):
+            # Find all blocks within the selection rectangle. The canvas
+            # already indexes the drawn bounding box of every item, so ask it
+            # for the overlapping items and keep the non-empty text blocks
+            # (canvas ids grow with creation, so sorting keeps block order)
+            for block_id in sorted(self.canvas.find_overlapping(x1, y1, x2, y2)):
+                block = self.text_handler.get_block(block_id)
+                if block is not None and self.text_handler.has_text(block_id):
                     self.add_block_to_selection(block)
             
             # Delete the selection rectangle
@@ -237,40 +257,38 @@ class SelectionHandler:
         
     def update_block_movement(self, x, y):
         """Update the position of selected blocks during movement."""
+        if self.is_moving_blocks and self.selected_blocks:
+            # Only the latest position matters, so apply it once Tk is idle
+            self.pending_move = (x, y)
+            if self.move_after_id is None:
+                self.move_after_id = self.canvas.after_idle(self.flush_block_movement)
+                
+    def flush_block_movement(self):
+        """Move the selected blocks to the latest pointer position of the drag."""
+        self.move_after_id = None
+        if self.pending_move is None:
+            return
+        x, y = self.pending_move
+        self.pending_move = None
+        
         if self.is_moving_blocks and self.selected_blocks:
             dx = x - self.move_start_x
             dy = y - self.move_start_y
             
-            # Move all selected blocks
+            # Move all selected blocks and their outlines (a move doesn't
+            # change a block's size) on the canvas in one call
+            self.canvas.move(SELECTED_TAG, dx, dy)
+            
+            # Update the block data to match, looking blocks up in the text
+            # handler's id -> block dict (bound once for the loop)
+            blocks_by_id = self.text_handler.text_blocks_by_id
+            set_block_position = self.text_handler.set_block_position
             for block_id in self.selected_blocks:
-                # Update the text block position
-                for block in self.text_handler.get_all_blocks():
-                    if block['id'] == block_id:
-                        new_x = block['x'] + dx
-                        new_y = block['y'] + dy
-                        
-                        # Move the text item
-                        self.canvas.coords(block_id, new_x, new_y)
-                        
-                        # Update the block data
-                        block['x'] = new_x
-                        block['y'] = new_y
-                        
-                        # Update the selection outline
-                        if block_id in self.selection_outlines:
-                            font_obj = tkFont.Font(font=("Helvetica", 12))
-                            lines = self.text_handler.wrap_text_to_width(block['text'], self.text_handler.block_width, font_obj)
-                            line_height = font_obj.metrics("linespace")
-                            max_width = min(max((font_obj.measure(line) for line in lines), default=0), self.text_handler.block_width)
-                            total_height = len(lines) * line_height
-                            
-                            self.canvas.coords(
-                                self.selection_outlines[block_id],
-                                new_x - 2, 
-                                new_y - 2, 
-                                new_x + max_width + 4, 
-                                new_y + total_height + 2
-                            )
+                block = blocks_by_id.get(block_id)
+                if block is None:
+                    continue
+                    
+                set_block_position(block_id, block['x'] + dx, block['y'] + dy)
             
             # Update the move start position
             self.move_start_x = x
@@ -278,22 +296,31 @@ class SelectionHandler:
             
     def end_block_movement(self, ctrl_pressed=False):
         """End moving selected blocks."""
+        # Apply the last motion before the drop
+        if self.move_after_id is not None:
+            self.canvas.after_cancel(self.move_after_id)
+            self.flush_block_movement()
         self.is_moving_blocks = False
         # If not control, we would typically clear other selections
+        # (the moved blocks stay selected, and their outlines already moved
+        # with them, so only blocks that no longer exist are dropped)
         if not ctrl_pressed:
-            selected_blocks = self.selected_blocks.copy()
-            self.clear_all_selections()
-            for block_id in selected_blocks:
-                for block in self.text_handler.get_all_blocks():
-                    if block['id'] == block_id:
-                        self.add_block_to_selection(block)
-                        break
+            self.clear_selection()
+            blocks_by_id = self.text_handler.text_blocks_by_id
+            deleted_blocks = [block_id for block_id in self.selected_blocks
+                              if block_id not in blocks_by_id]
+            if deleted_blocks:
+                for block_id in deleted_blocks:
+                    self.canvas.delete(self.selection_outlines.pop(block_id))
+                self.selected_blocks = [block_id for block_id in self.selected_blocks
+                                        if block_id in self.selection_outlines]
                         
     def select_all_blocks(self):
         """Select all text blocks."""
         self.clear_all_selections()
+        add_block_to_selection = self.add_block_to_selection
         for block in self.text_handler.get_all_blocks():
-            self.add_block_to_selection(block)
+            add_block_to_selection(block)
             
     def get_selected_blocks(self):
         """Get the list of selected block IDs."""
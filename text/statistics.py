@@ -2,80 +2,152 @@
 Document statistics calculations for the Word-Style TextEditor.
 """
 
+import re
+
+# A sentence: text up to the next period, exclamation point or question mark,
+# starting at its first non-whitespace character
+SENTENCE_RE = re.compile(r"[^.!?\s][^.!?]*")
+
+# A paragraph: text up to the next blank line ("\n\n"), starting at its first
+# non-whitespace character
+PARAGRAPH_RE = re.compile(r"\S[^\n]*(?:\n(?!\n)[^\n]*)*")
+
 class DocumentStatistics:
     def __init__(self, text_widget):
         self.text_widget = text_widget
         
-    def get_word_count(self):
+        # Result of the last get_all_statistics and the text it was computed
+        # from. The cache is keyed on the text itself rather than cleared on
+        # <<Modified>>: Tk only fires that when the modified flag changes, and
+        # the flag belongs to FileOperations (which resets it after each edit).
+        self.cached_statistics = None
+        self.cached_text = None
+        
+    def get_text(self):
+        """Get the document text."""
+        return self.text_widget.get("1.0", "end-1c")
+        
+    def get_counts(self):
+        """
+        Get the character and line counts without copying the document text.
+        
+        Returns:
+            tuple: (characters, lines), counted by the Tk text widget
+        """
+        # Text.count returns None when every count is zero (Tk 8.5+)
+        chars, newlines = self.text_widget.count("1.0", "end-1c", "chars", "lines") or (0, 0)
+        return chars, newlines + 1
+        
+    def _cached(self, key, text):
+        """Get a statistic from the last get_all_statistics, or None if it wasn't computed from text."""
+        if self.cached_statistics is None or text != self.cached_text:
+            return None
+        return self.cached_statistics[key]
+        
+    def get_word_count(self, text=None):
         """Get the number of words in the document."""
-        text = self.text_widget.get("1.0", "end-1c")
-        if not text.strip():
-            return 0
+        if text is None:
+            text = self.get_text()
+            word_count = self._cached("word_count", text)
+            if word_count is not None:
+                return word_count
+        # str.split() counts whitespace-separated words in C and is faster than a regex scan
         return len(text.split())
     
-    def get_character_count(self, include_spaces=True):
+    def get_character_count(self, include_spaces=True, text=None):
         """Get the number of characters in the document."""
-        text = self.text_widget.get("1.0", "end-1c")
+        if text is None:
+            if include_spaces:
+                return self.get_counts()[0]
+            text = self.get_text()
+            char_count = self._cached("character_count_no_spaces", text)
+            if char_count is not None:
+                return char_count
         if not include_spaces:
-            text = text.replace(" ", "")
+            return len(text) - text.count(" ")
         return len(text)
     
-    def get_line_count(self):
+    def get_line_count(self, text=None):
         """Get the number of lines in the document."""
-        text = self.text_widget.get("1.0", "end-1c")
+        if text is None:
+            return self.get_counts()[1]
         return text.count('\n') + 1
     
-    def get_paragraph_count(self):
+    def get_paragraph_count(self, text=None):
         """Get the number of paragraphs in the document."""
-        text = self.text_widget.get("1.0", "end-1c")
-        paragraphs = [p for p in text.split('\n\n') if p.strip()]
-        return max(1, len(paragraphs))
+        if text is None:
+            text = self.get_text()
+            paragraph_count = self._cached("paragraph_count", text)
+            if paragraph_count is not None:
+                return paragraph_count
+        # Count the non-blank pieces between "\n\n" without splitting the text into a list
+        paragraphs = sum(1 for _ in PARAGRAPH_RE.finditer(text))
+        return max(1, paragraphs)
     
-    def get_sentence_count(self):
+    def get_sentence_count(self, text=None):
         """Get the approximate number of sentences in the document."""
-        text = self.text_widget.get("1.0", "end-1c")
-        # This is a simple approximation that counts periods, exclamation points, and question marks
-        sentences = [s for s in text.replace('!', '.').replace('?', '.').split('.') if s.strip()]
-        return max(1, len(sentences))
+        if text is None:
+            text = self.get_text()
+            sentence_count = self._cached("sentence_count", text)
+            if sentence_count is not None:
+                return sentence_count
+        # This is a simple approximation that counts the non-blank pieces between periods,
+        # exclamation points and question marks (scanned in C without copying the text)
+        sentences = sum(1 for _ in SENTENCE_RE.finditer(text))
+        return max(1, sentences)
     
-    def estimate_page_count(self, words_per_page=500):
+    def estimate_page_count(self, words_per_page=500, word_count=None):
         """
         Estimate the number of pages in the document.
         
         Args:
             words_per_page: The average number of words per page (defaults to 500)
+            word_count: Precomputed word count (read from the document if omitted)
             
         Returns:
             int: Estimated number of pages
         """
-        word_count = self.get_word_count()
+        if word_count is None:
+            word_count = self.get_word_count()
         return max(1, (word_count + words_per_page - 1) // words_per_page)
     
-    def get_reading_time(self, words_per_minute=200):
+    def get_reading_time(self, words_per_minute=200, word_count=None):
         """
         Calculate the estimated reading time in minutes.
         
         Args:
             words_per_minute: Average reading speed (defaults to 200 wpm)
+            word_count: Precomputed word count (read from the document if omitted)
             
         Returns:
             float: Estimated reading time in minutes
         """
-        word_count = self.get_word_count()
+        if word_count is None:
+            word_count = self.get_word_count()
         return word_count / words_per_minute
     
     def get_all_statistics(self):
         """Get all document statistics in a dictionary."""
-        return {
-            "word_count": self.get_word_count(),
-            "character_count": self.get_character_count(),
-            "character_count_no_spaces": self.get_character_count(include_spaces=False),
-            "line_count": self.get_line_count(),
-            "paragraph_count": self.get_paragraph_count(),
-            "sentence_count": self.get_sentence_count(),
-            "page_count": self.estimate_page_count(),
-            "reading_time_minutes": self.get_reading_time()
+        # Read the document once and derive every statistic from the same string
+        text = self.get_text()
+        
+        # Nothing to recount while the document is unchanged
+        if self.cached_statistics is not None and text == self.cached_text:
+            return dict(self.cached_statistics)
+            
+        word_count = self.get_word_count(text)
+        self.cached_statistics = {
+            "word_count": word_count,
+            "character_count": self.get_character_count(text=text),
+            "character_count_no_spaces": self.get_character_count(include_spaces=False, text=text),
+            "line_count": self.get_line_count(text),
+            "paragraph_count": self.get_paragraph_count(text),
+            "sentence_count": self.get_sentence_count(text),
+            "page_count": self.estimate_page_count(word_count=word_count),
+            "reading_time_minutes": self.get_reading_time(word_count=word_count)
         }
+        self.cached_text = text
+        return dict(self.cached_statistics)
     
     def format_reading_time(self, reading_time_minutes):
         """Format reading time in a human-readable string."""
@@ -30,9 +30,11 @@ class DocumentManager:
         self.editor_frame = None
         self.h_ruler_frame = None
         self.h_ruler_canvas = None
+        self.h_ruler_image = None
         self.document_area = None
         self.v_ruler_frame = None
         self.v_ruler_canvas = None
+        self.v_ruler_image = None
         self.document_frame = None
         self.v_scrollbar = None
         self.h_scrollbar = None
@@ -153,27 +155,21 @@ class DocumentManager:
         )
         self.h_ruler_canvas.pack(fill=tk.X)
         
-        # Draw ruler markings (assuming 96 DPI)
-        for i in range(0, self.page_width_px + 100, 96):  # Every inch (96 pixels)
-            # Draw major tick and label
-            self.h_ruler_canvas.create_line(
-                i, 18, i, 10, 
-                fill=self.theme["ruler_tick"]
-            )
+        # Draw ruler markings (assuming 96 DPI). All ticks go into one image
+        # item instead of a canvas line each; the labels stay text items
+        ruler_length = self.page_width_px + 100
+        self.h_ruler_image = tk.PhotoImage(width=ruler_length + 96, height=20)
+        self.draw_ruler_ticks(self.h_ruler_image, ruler_length, vertical=False)
+        self.h_ruler_canvas.create_image(0, 0, anchor='nw', image=self.h_ruler_image)
+        
+        for i in range(0, ruler_length, 96):  # Every inch (96 pixels)
             self.h_ruler_canvas.create_text(
                 i, 5, 
                 text=str(i // 96), 
                 fill=self.theme["ruler_text"],
-                font=("Arial", 7)
+                font=("Arial", 7),
+                tags="ruler_label"
             )
-            
-            # Draw minor ticks (1/4 inch)
-            for j in range(1, 4):
-                minor_tick = i + (j * 24)  # 96/4 = 24 pixels per 1/4 inch
-                self.h_ruler_canvas.create_line(
-                    minor_tick, 18, minor_tick, 14, 
-                    fill=self.theme["ruler_tick"]
-                )
     
     def create_vertical_ruler(self):
         """Create the vertical ruler."""
@@ -186,26 +182,30 @@ class DocumentManager:
         self.v_ruler_canvas.pack(fill=tk.Y)
         
         # Draw ruler markings (assuming 96 DPI)
-        for i in range(0, self.page_height_px + 100, 96):  # Every inch (96 pixels)
-            # Draw major tick and label
-            self.v_ruler_canvas.create_line(
-                28, i, 20, i, 
-                fill=self.theme["ruler_tick"]
-            )
+        ruler_length = self.page_height_px + 100
+        self.v_ruler_image = tk.PhotoImage(width=30, height=ruler_length + 96)
+        self.draw_ruler_ticks(self.v_ruler_image, ruler_length, vertical=True)
+        self.v_ruler_canvas.create_image(0, 0, anchor='nw', image=self.v_ruler_image)
+        
+        for i in range(0, ruler_length, 96):  # Every inch (96 pixels)
             self.v_ruler_canvas.create_text(
                 15, i, 
                 text=str(i // 96), 
                 fill=self.theme["ruler_text"],
-                font=("Arial", 7)
+                font=("Arial", 7),
+                tags="ruler_label"
             )
-            
-            # Draw minor ticks (1/4 inch)
-            for j in range(1, 4):
-                minor_tick = i + (j * 24)  # 96/4 = 24 pixels per 1/4 inch
-                self.v_ruler_canvas.create_line(
-                    28, minor_tick, 24, minor_tick, 
-                    fill=self.theme["ruler_tick"]
-                )
+    
+    def draw_ruler_ticks(self, image, ruler_length, vertical):
+        """Draw the inch and quarter-inch ticks of a ruler into its (transparent) image."""
+        tick_color = self.theme["ruler_tick"]
+        for i in range(0, ruler_length, 96):  # Every inch (96 pixels)
+            # Major tick, then minor ticks (1/4 inch = 24 pixels)
+            for tick, tick_length in ((i, 8), (i + 24, 4), (i + 48, 4), (i + 72, 4)):
+                if vertical:
+                    image.put(tick_color, to=(29 - tick_length, tick, 29, tick + 1))
+                else:
+                    image.put(tick_color, to=(tick, 18 - tick_length, tick + 1, 18))
                 
     def update_theme(self, theme):
         """Update the theme of all document components."""
@@ -222,6 +222,14 @@ class DocumentManager:
         self.h_ruler_canvas.configure(bg=theme["ruler_bg"])
         self.v_ruler_canvas.configure(bg=theme["ruler_bg"])
         
+        # Redraw the tick images and recolor all labels of each ruler at once
+        self.h_ruler_image.blank()
+        self.draw_ruler_ticks(self.h_ruler_image, self.page_width_px + 100, vertical=False)
+        self.v_ruler_image.blank()
+        self.draw_ruler_ticks(self.v_ruler_image, self.page_height_px + 100, vertical=True)
+        self.h_ruler_canvas.itemconfig("ruler_label", fill=theme["ruler_text"])
+        self.v_ruler_canvas.itemconfig("ruler_label", fill=theme["ruler_text"])
+        
         # Update document canvas and page
         self.document_canvas.configure(bg=theme["bg_color"])
         self.page_frame.configure(
@@ -3,7 +3,83 @@ Status bar UI manager for the TextEditor.
 Handles status messages and document statistics.
 """
 
+import re
 import tkinter as tk
+from tkinter import font
+
+# Approximate number of words on a page, for the page count
+WORDS_PER_PAGE = 500
+
+# Label prefixes of the statistics, followed by the count
+WORDS_PREFIX = "Words: "
+CHARACTERS_PREFIX = "Characters: "
+PAGES_PREFIX = "Page: 1/"
+
+# Start of a word: a non-whitespace character not preceded by one
+WORD_START_RE = re.compile(r"(?<!\S)\S")
+
+# Characters split at a time by count_words
+WORD_COUNT_CHUNK_SIZE = 65536
+
+def count_words(text):
+    """Count the whitespace-separated words of text."""
+    # split() in C is the fastest counter, but on the whole document it builds
+    # a list with every word. Splitting fixed-size chunks keeps that list
+    # small; a word cut by a chunk boundary is counted in both chunks, so
+    # count it once.
+    word_count = 0
+    for start in range(0, len(text), WORD_COUNT_CHUNK_SIZE):
+        word_count += len(text[start:start + WORD_COUNT_CHUNK_SIZE].split())
+        if start and not text[start].isspace() and not text[start - 1].isspace():
+            word_count -= 1
+    return word_count
+
+def count_word_starts(text, start, end):
+    """Count the words of text that start at an index in [start, end)."""
+    return sum(1 for _ in WORD_START_RE.finditer(text, start, end))
+
+def common_prefix_length(a, b):
+    """Length of the longest common prefix of two strings."""
+    # Binary search that only compares the not yet matched part, so the
+    # slices copied add up to about the length of the shorter string
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a.startswith(b[low:middle], low):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def common_suffix_length(a, b, limit):
+    """Length of the longest common suffix of two strings, at most limit."""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a.endswith(b[len(b) - middle:len(b) - low], 0, len(a) - low):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def recount_words(old_text, old_word_count, text):
+    """
+    Count the words of text, given the word count of an earlier version of it.
+    
+    Only word starts in the edited span (and just after it) can differ: a word
+    starts where a non-space follows a space, so starts in the unchanged
+    prefix and suffix stay the same. Comparing the two versions runs at
+    memcmp speed; only the edited span is scanned for words.
+    """
+    # Unchanged text (e.g. a refresh after cursor moves) needs no scan at all
+    if text == old_text:
+        return old_word_count
+    prefix = common_prefix_length(old_text, text)
+    suffix = common_suffix_length(old_text, text, min(len(old_text), len(text)) - prefix)
+    old_end = min(len(old_text) - suffix + 1, len(old_text))
+    new_end = min(len(text) - suffix + 1, len(text))
+    return (old_word_count + count_word_starts(text, prefix, new_end)
+            - count_word_starts(old_text, prefix, old_end))
 
 class StatusBarManager:
     def __init__(self, parent_frame, theme):
@@ -15,6 +91,20 @@ class StatusBarManager:
         self.char_count = 0
         self.page_count = 1
         
+        # Word counts for which page_count stays the same (exclusive of the
+        # lower bound), so it's only recomputed when a page boundary is crossed
+        self.page_words_low = -1
+        self.page_words_high = WORDS_PER_PAGE
+        
+        # Counts currently shown by the labels, so unchanged ones aren't set again
+        self.shown_word_count = 0
+        self.shown_char_count = 0
+        self.shown_page_count = 1
+        
+        # Whether the status bar is mapped; hidden, the labels are only
+        # refreshed once it is shown again
+        self.visible = True
+        
         # Status bar components
         self.status_frame = None
         self.status_var = None
@@ -23,6 +113,12 @@ class StatusBarManager:
         self.char_count_var = None
         self.page_count_var = None
         
+        # Font shared by all the labels
+        self.label_font = None
+        
+        # Labels styled with the theme's status bar colors
+        self.themed_labels = []
+        
         # Initialize UI
         self.setup_ui()
         
@@ -30,6 +126,12 @@ class StatusBarManager:
         """Set up the status bar UI."""
         self.status_frame = tk.Frame(self.parent_frame, bg=self.theme["status_bg"], height=25)
         self.status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_frame.bind("<Map>", self.on_map)
+        self.status_frame.bind("<Unmap>", self.on_unmap)
+        
+        # One named font for every label, instead of a font description
+        # parsed by Tk for each of them
+        self.label_font = font.Font(family="Calibri", size=9)
         
         # Status message (left side)
         self.status_var = tk.StringVar(value="Ready")
@@ -38,7 +140,7 @@ class StatusBarManager:
             textvariable=self.status_var,
             bg=self.theme["status_bg"],
             fg=self.theme["text_color"],
-            font=("Calibri", 9),
+            font=self.label_font,
             anchor=tk.W,
             padx=10
         )
@@ -49,43 +151,49 @@ class StatusBarManager:
         self.stats_frame.pack(side=tk.RIGHT, padx=10)
         
         # Word count
-        self.word_count_var = tk.StringVar(value="Words: 0")
+        self.word_count_var = tk.StringVar(value=WORDS_PREFIX + "0")
         word_count_label = tk.Label(
             self.stats_frame,
             textvariable=self.word_count_var,
             bg=self.theme["status_bg"],
             fg=self.theme["text_color"],
-            font=("Calibri", 9),
+            font=self.label_font,
             padx=5
         )
         word_count_label.pack(side=tk.LEFT)
         
         # Character count
-        self.char_count_var = tk.StringVar(value="Characters: 0")
+        self.char_count_var = tk.StringVar(value=CHARACTERS_PREFIX + "0")
         char_count_label = tk.Label(
             self.stats_frame,
             textvariable=self.char_count_var,
             bg=self.theme["status_bg"],
             fg=self.theme["text_color"],
-            font=("Calibri", 9),
+            font=self.label_font,
             padx=5
         )
         char_count_label.pack(side=tk.LEFT)
         
         # Page count
-        self.page_count_var = tk.StringVar(value="Page: 1/1")
+        self.page_count_var = tk.StringVar(value=PAGES_PREFIX + "1")
         page_count_label = tk.Label(
             self.stats_frame,
             textvariable=self.page_count_var,
             bg=self.theme["status_bg"],
             fg=self.theme["text_color"],
-            font=("Calibri", 9),
+            font=self.label_font,
             padx=5
         )
         page_count_label.pack(side=tk.LEFT)
         
+        self.themed_labels = [status_label, word_count_label, char_count_label, page_count_label]
+        
     def update_theme(self, theme):
         """Update the theme of status bar components."""
+        # Theme manager themes are shared objects, so the same one means
+        # every widget already has its colors
+        if theme is self.theme:
+            return
         self.theme = theme
         
         # Update status bar frame
@@ -93,39 +201,80 @@ class StatusBarManager:
         self.stats_frame.configure(bg=theme["status_bg"])
         
         # Update labels
-        for widget in self.status_frame.winfo_children():
-            if isinstance(widget, tk.Label):
-                widget.configure(bg=theme["status_bg"], fg=theme["text_color"])
-                
-        for widget in self.stats_frame.winfo_children():
-            if isinstance(widget, tk.Label):
-                widget.configure(bg=theme["status_bg"], fg=theme["text_color"])
+        for label in self.themed_labels:
+            label.configure(bg=theme["status_bg"], fg=theme["text_color"])
                 
+    def on_map(self, event):
+        """Show the statistics that changed while the status bar was hidden."""
+        self.visible = True
+        self.refresh_statistics()
+            
+    def on_unmap(self, event):
+        """Stop updating the labels while the status bar is hidden."""
+        self.visible = False
+        
     def update_status(self, message):
         """Update the status message."""
         self.status_var.set(message)
         
     def update_statistics(self, text):
         """Update document statistics based on the text content."""
-        # Count words
-        if text.strip():
-            words = text.split()
-            self.word_count = len(words)
-        else:
-            self.word_count = 0
-            
-        # Count characters
-        self.char_count = len(text)
+        return self.set_counts(count_words(text), len(text))
+        
+    def set_counts(self, word_count, char_count):
+        """Show word and character counts computed elsewhere (e.g. on a worker thread)."""
+        self.word_count = word_count
+        self.char_count = char_count
         
+        return self.refresh_statistics()
+        
+    def add_inserted_text(self, text, before="", after=""):
+        """
+        Update document statistics for text inserted at a single position.
+        
+        Only the inserted text and the characters on either side of it are
+        scanned, so the cost does not depend on the document size.
+        
+        Args:
+            text: The inserted text
+            before: The character just before the insertion point
+            after: The character just after the insertion point
+        """
+        # Words can merge with (or split) the neighbouring words at the edges
+        self.word_count += len((before + text + after).split()) - len((before + after).split())
+        self.char_count += len(text)
+        
+        return self.refresh_statistics()
+        
+    def refresh_statistics(self):
+        """Show the current document statistics in the status bar."""
         # Estimated page count (approximate)
-        # A typical page has about 500 words
-        self.page_count = max(1, (self.word_count + 499) // 500)
+        # (integer ceiling division; an empty document still has one page)
+        if not self.page_words_low < self.word_count <= self.page_words_high:
+            self.page_count = (self.word_count + WORDS_PER_PAGE - 1) // WORDS_PER_PAGE or 1
+            self.page_words_high = self.page_count * WORDS_PER_PAGE
+            self.page_words_low = self.page_words_high - WORDS_PER_PAGE if self.page_count > 1 else -1
+            
+        # Hidden labels are brought up to date when the status bar is mapped
+        if not self.visible:
+            return self.get_statistics()
+        
+        # Update status bar (each set is a Tcl call and a label redraw, so
+        # only for the counts that changed)
+        if self.word_count != self.shown_word_count:
+            self.word_count_var.set(WORDS_PREFIX + str(self.word_count))
+            self.shown_word_count = self.word_count
+        if self.char_count != self.shown_char_count:
+            self.char_count_var.set(CHARACTERS_PREFIX + str(self.char_count))
+            self.shown_char_count = self.char_count
+        if self.page_count != self.shown_page_count:
+            self.page_count_var.set(PAGES_PREFIX + str(self.page_count))
+            self.shown_page_count = self.page_count
         
-        # Update status bar
-        self.word_count_var.set(f"Words: {self.word_count}")
-        self.char_count_var.set(f"Characters: {self.char_count}")
-        self.page_count_var.set(f"Page: 1/{self.page_count}")
+        return self.get_statistics()
         
+    def get_statistics(self):
+        """Get the statistics currently shown in the status bar."""
         return {
             "word_count": self.word_count,
             "char_count": self.char_count,
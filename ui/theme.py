@@ -3,11 +3,14 @@ Theme manager for the TextEditor.
 Handles theme settings and switching between light and dark mode.
 """
 
+from types import MappingProxyType
+
 class ThemeManager:
     def __init__(self):
-        # Define theme settings
-        self.themes = {
-            "light": {
+        # Define theme settings (read-only: the same theme objects are shared
+        # by every component, and compared by identity to skip no-op swaps)
+        self.themes = MappingProxyType({
+            "light": MappingProxyType({
                 "bg_color": "#f8f9fa",
                 "accent_color": "#4285f4",
                 "text_color": "#212529",
@@ -20,8 +23,8 @@ class ThemeManager:
                 "ruler_text": "#666666",
                 "ruler_tick": "#999999",
                 "selection_color": "#e8f0fe"
-            },
-            "dark": {
+            }),
+            "dark": MappingProxyType({
                 "bg_color": "#212529",
                 "accent_color": "#4285f4",
                 "text_color": "#e9ecef",
@@ -34,21 +37,30 @@ class ThemeManager:
                 "ruler_text": "#adb5bd",
                 "ruler_tick": "#6c757d",
                 "selection_color": "#3b5bdb"
-            }
-        }
+            })
+        })
         self.current_theme = "light"
         
+        # Theme object of current_theme, kept so the common get_theme() call
+        # is a single attribute read
+        self.current_theme_settings = self.themes["light"]
+        
     def get_theme(self, theme_name=None):
         """Get the specified theme or current theme if none specified."""
         if theme_name is None:
-            theme_name = self.current_theme
+            return self.current_theme_settings
             
-        return self.themes.get(theme_name, self.themes["light"])
+        # Only look up the light fallback for an unknown name
+        theme = self.themes.get(theme_name)
+        if theme is None:
+            theme = self.themes["light"]
+        return theme
         
     def set_current_theme(self, theme_name):
         """Set the current theme."""
         if theme_name in self.themes:
             self.current_theme = theme_name
+            self.current_theme_settings = self.themes[theme_name]
             return True
         return False
         
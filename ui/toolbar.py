@@ -3,9 +3,15 @@ Toolbar UI manager for the TextEditor.
 Handles formatting toolbar and formatting functions.
 """
 
+import functools
 import tkinter as tk
 from tkinter import font, ttk
 
+@functools.lru_cache(maxsize=None)
+def get_font_families():
+    """Get the installed font families, sorted (the font list is read from Tk once per process)."""
+    return tuple(sorted(font.families()))
+
 class ToolbarManager:
     def __init__(self, parent_frame, theme, text_widget, format_callbacks=None):
         self.parent_frame = parent_frame
@@ -13,6 +19,15 @@ class ToolbarManager:
         self.text_widget = text_widget
         self.callbacks = format_callbacks or {}
         
+        # Formatting tags styled by the default toggles. The text widget may
+        # only be set after construction, so each tag is configured on first
+        # use; its font is kept alive while the tag uses it.
+        self.configured_tags = set()
+        self.tag_fonts = {}
+            
+        # Justification the "align" tag is configured with
+        self.align_justify = None
+        
         # Default font settings
         self.default_font = ("Calibri", 11)
         
@@ -32,6 +47,9 @@ class ToolbarManager:
         self.align_right_button = None
         self.mic_button = None
         
+        # Buttons styled with the theme's button colors
+        self.themed_buttons = []
+        
         # Initialize UI
         self.setup_toolbar()
         
@@ -41,15 +59,13 @@ class ToolbarManager:
         self.toolbar_frame = tk.Frame(self.parent_frame, bg=self.theme["bg_color"], bd=1, relief=tk.SOLID)
         self.toolbar_frame.pack(fill=tk.X, padx=1, pady=(1, 5))
         
-        # Font family combo box
-        font_families = list(font.families())
-        font_families.sort()
-        
+        # Font family combo box. Its list is only filled when it first drops
+        # down, so enumerating the installed fonts stays off the startup path
         self.font_family_combo = ttk.Combobox(
             self.toolbar_frame, 
             textvariable=self.font_family_var,
             width=15,
-            values=font_families
+            postcommand=self.load_font_families
         )
         self.font_family_combo.pack(side=tk.LEFT, padx=5, pady=5)
         self.font_family_combo.bind("<<ComboboxSelected>>", self.on_font_change)
@@ -148,8 +164,23 @@ class ToolbarManager:
         )
         self.mic_button.pack(side=tk.LEFT, padx=2)
         
+        self.themed_buttons = [
+            self.bold_button, self.italic_button, self.underline_button,
+            self.align_left_button, self.align_center_button, self.align_right_button,
+            self.mic_button
+        ]
+        
+    def load_font_families(self):
+        """Fill the font family list before it is shown for the first time."""
+        if not self.font_family_combo.cget("values"):
+            self.font_family_combo.configure(values=get_font_families())
+            
     def update_theme(self, theme):
         """Update the theme of toolbar components."""
+        # Theme manager themes are shared objects, so the same one means
+        # every widget already has its colors
+        if theme is self.theme:
+            return
         self.theme = theme
         
         # Update toolbar frame
@@ -160,13 +191,8 @@ class ToolbarManager:
             "bg": theme["button_bg"],
             "fg": theme["button_fg"]
         }
-        self.bold_button.configure(**button_config)
-        self.italic_button.configure(**button_config)
-        self.underline_button.configure(**button_config)
-        self.align_left_button.configure(**button_config)
-        self.align_center_button.configure(**button_config)
-        self.align_right_button.configure(**button_config)
-        self.mic_button.configure(**button_config)
+        for button in self.themed_buttons:
+            button.configure(**button_config)
         
     def on_font_change(self, event=None):
         """Handle font selection changes."""
@@ -185,19 +211,7 @@ class ToolbarManager:
             
     def _default_toggle_bold(self):
         """Default bold toggle implementation."""
-        if not self.text_widget.tag_ranges(tk.SEL):
-            return
-            
-        # Check if selection already has bold tag
-        current_tags = self.text_widget.tag_names(tk.SEL_FIRST)
-        
-        if "bold" in current_tags:
-            # Remove bold
-            self.text_widget.tag_remove("bold", tk.SEL_FIRST, tk.SEL_LAST)
-        else:
-            # Apply bold
-            self.text_widget.tag_configure("bold", font=(None, None, "bold"))
-            self.text_widget.tag_add("bold", tk.SEL_FIRST, tk.SEL_LAST)
+        self._toggle_tag("bold")
             
     def toggle_italic(self):
         """Toggle italic formatting on selected text."""
@@ -208,19 +222,7 @@ class ToolbarManager:
             
     def _default_toggle_italic(self):
         """Default italic toggle implementation."""
-        if not self.text_widget.tag_ranges(tk.SEL):
-            return
-            
-        # Check if selection already has italic tag
-        current_tags = self.text_widget.tag_names(tk.SEL_FIRST)
-        
-        if "italic" in current_tags:
-            # Remove italic
-            self.text_widget.tag_remove("italic", tk.SEL_FIRST, tk.SEL_LAST)
-        else:
-            # Apply italic
-            self.text_widget.tag_configure("italic", font=(None, None, "italic"))
-            self.text_widget.tag_add("italic", tk.SEL_FIRST, tk.SEL_LAST)
+        self._toggle_tag("italic")
             
     def toggle_underline(self):
         """Toggle underline formatting on selected text."""
@@ -231,19 +233,41 @@ class ToolbarManager:
             
     def _default_toggle_underline(self):
         """Default underline toggle implementation."""
+        self._toggle_tag("underline")
+            
+    def _ensure_tag(self, name):
+        """Configure a formatting tag the first time it is used."""
+        if name in self.configured_tags:
+            return
+            
+        if name == "underline":
+            self.text_widget.tag_configure(name, underline=True)
+        else:
+            # A copy of the widget's font (font.Font instead of tuples with None)
+            tag_font = font.Font(self.text_widget, self.text_widget.cget("font"))
+            if name == "bold":
+                tag_font.configure(weight="bold")
+            else:
+                tag_font.configure(slant="italic")
+            self.text_widget.tag_configure(name, font=tag_font)
+            self.tag_fonts[name] = tag_font
+        self.configured_tags.add(name)
+            
+    def _toggle_tag(self, name):
+        """Toggle the bold, italic or underline tag on the selected text."""
         if not self.text_widget.tag_ranges(tk.SEL):
             return
             
-        # Check if selection already has underline tag
+        # Check if selection already has the tag
         current_tags = self.text_widget.tag_names(tk.SEL_FIRST)
         
-        if "underline" in current_tags:
-            # Remove underline
-            self.text_widget.tag_remove("underline", tk.SEL_FIRST, tk.SEL_LAST)
+        if name in current_tags:
+            # Remove the formatting
+            self.text_widget.tag_remove(name, tk.SEL_FIRST, tk.SEL_LAST)
         else:
-            # Apply underline
-            self.text_widget.tag_configure("underline", underline=True)
-            self.text_widget.tag_add("underline", tk.SEL_FIRST, tk.SEL_LAST)
+            # Apply the formatting
+            self._ensure_tag(name)
+            self.text_widget.tag_add(name, tk.SEL_FIRST, tk.SEL_LAST)
             
     def set_alignment(self, alignment):
         """Set text alignment for the paragraph."""
@@ -254,14 +278,16 @@ class ToolbarManager:
             
     def _default_set_alignment(self, alignment):
         """Default alignment implementation."""
-        if alignment == "left":
-            self.text_widget.tag_configure("align", justify=tk.LEFT)
-        elif alignment == "center":
-            self.text_widget.tag_configure("align", justify=tk.CENTER)
+        if alignment == "center":
+            justify = tk.CENTER
         elif alignment == "right":
-            self.text_widget.tag_configure("align", justify=tk.RIGHT)
-        else:  # justify
-            self.text_widget.tag_configure("align", justify=tk.LEFT)
+            justify = tk.RIGHT
+        else:  # left or justify
+            justify = tk.LEFT
+        # Only reconfigure the tag when the justification changes
+        if justify != self.align_justify:
+            self.text_widget.tag_configure("align", justify=justify)
+            self.align_justify = justify
             
         # Apply to entire paragraph if no selection
         if not self.text_widget.tag_ranges(tk.SEL):